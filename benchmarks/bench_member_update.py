@@ -0,0 +1,126 @@
+"""Micro-benchmark for WebVerifier's on_member_update listener.
+
+Replays a stream of member updates, most of them unrelated to verification
+(nickname changes, other roles), through three versions of the listener:
+
+* ``config``: the original listener, which read ``verification_enabled``,
+  ``role_id`` and ``verified_members`` from Config on every event.
+* ``snapshot``: reads the cached guild settings but still scans
+  ``guild.roles`` and both members' role lists.
+* ``fast path``: the current listener, which returns after one dict lookup
+  for guilds without a verified role and uses ``Member.get_role`` otherwise.
+
+Run from the repository root::
+
+    python -m benchmarks.bench_member_update --events 200000
+"""
+import argparse
+import asyncio
+import random
+import time
+
+from discord.utils import get
+
+from .fakes import FakeBot, FakeGuild, fake_config
+
+with fake_config():
+    from web_verifier.web_verifier import WebVerifier
+
+
+async def config_listener(cog, before, after):
+    verification_enabled = await cog.config.guild(after.guild).verification_enabled()
+    if not verification_enabled:
+        return
+    role_id = await cog.config.guild(after.guild).role_id()
+    if not role_id:
+        return
+    verified_role = get(after.guild.roles, id=role_id)
+    if not verified_role:
+        return
+    if verified_role not in before.roles and verified_role in after.roles:
+        verified_members = await cog.config.verified_members()
+        if str(after.id) not in verified_members:
+            await after.remove_roles(verified_role, reason="User not in verified members list")
+
+
+async def snapshot_listener(cog, before, after):
+    settings = cog.guild_settings(after.guild)
+    if not settings.enabled or not settings.role_id:
+        return
+    verified_role = get(after.guild.roles, id=settings.role_id)
+    if not verified_role:
+        return
+    if verified_role not in before.roles and verified_role in after.roles:
+        if after.id not in cog.verified_index:
+            await after.remove_roles(verified_role, reason="User not in verified members list")
+
+
+async def fast_listener(cog, before, after):
+    await cog.on_member_update(before, after)
+
+
+async def build(guilds: int, enabled: int, members: int, roles: int):
+    bot = FakeBot()
+    with fake_config():
+        cog = WebVerifier(bot)
+
+    verified = {}
+    for index in range(guilds):
+        guild = bot.add_guild(FakeGuild(f"guild-{index}"))
+        extra_roles = [guild.add_role(f"role-{n}") for n in range(roles)]
+        verified_role = guild.add_role("Verified")
+        if index < enabled:
+            await cog.config.guild(guild).verification_enabled.set(True)
+            await cog.config.guild(guild).role_id.set(verified_role.id)
+        for n in range(members):
+            member = guild.add_member(name=f"member-{n}", roles=random.sample(extra_roles, 3))
+            if n % 2:
+                verified[str(member.id)] = str(member.id % 1000000)  # user_id -> member_id, as stored
+    await cog.config.verified_members.set(verified)
+    cog.verified_index.load(verified)
+    await cog.load_guild_settings()
+    return bot, cog
+
+
+def make_events(bot, count: int):
+    """Mostly unrelated updates, with 1% of events adding the verified role."""
+    members = [member for guild in bot.guilds for member in guild.members]
+    events = []
+    for _ in range(count):
+        member = random.choice(members)
+        if random.random() < 0.01:
+            verified_role = member.guild.roles[-1]
+            events.append((member, member.copy_with(roles=member.roles + [verified_role])))
+        else:
+            events.append((member, member.copy_with(display_name=f"{member.name}-nick")))
+    return events
+
+
+async def measure(name, listener, cog, events):
+    start = time.perf_counter()
+    for before, after in events:
+        await listener(cog, before, after)
+    elapsed = time.perf_counter() - start
+    print(f"{name:>10}: {len(events) / elapsed:>12,.0f} events/s  ({elapsed * 1e6 / len(events):.2f} us/event)")
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--events", type=int, default=100000)
+    parser.add_argument("--guilds", type=int, default=50)
+    parser.add_argument("--enabled", type=int, default=10, help="Guilds with verification enabled")
+    parser.add_argument("--members", type=int, default=200, help="Members per guild")
+    parser.add_argument("--roles", type=int, default=100, help="Unrelated roles per guild")
+    args = parser.parse_args()
+
+    random.seed(0)
+    bot, cog = await build(args.guilds, args.enabled, args.members, args.roles)
+    events = make_events(bot, args.events)
+    print(f"{args.events} events across {args.guilds} guilds ({args.enabled} enabled), {args.roles} roles per guild")
+    await measure("config", config_listener, cog, events)
+    await measure("snapshot", snapshot_listener, cog, events)
+    await measure("fast path", fast_listener, cog, events)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,166 @@
+"""Load test for WebVerifier's ``/discord-auth/return`` endpoint.
+
+Runs the cog's aiohttp application in-process on a local test server, backed
+by fake guilds and members and an in-memory Config, and fires signed JWTs at
+it with a fixed number of concurrent clients. Each scenario reports
+throughput, p50/p95/p99 latency and the status codes returned.
+
+Scenarios:
+
+* ``single``: every token verifies a different user who is in one guild.
+* ``multi``: every user is in ``--guilds-per-user`` enabled guilds, so each
+  verification fans out role grants across all of them.
+* ``invalid``: tokens signed with the wrong secret, rejected with 401.
+* ``replay``: a small set of valid tokens each submitted many times.
+
+Run from the repository root::
+
+    python -m benchmarks.bench_verification --requests 5000 --concurrency 64
+"""
+import argparse
+import asyncio
+import time
+import uuid
+from collections import Counter
+
+import aiohttp
+import jwt
+from aiohttp.test_utils import TestServer
+
+from .fakes import FakeBot, FakeGuild, fake_config
+
+with fake_config():
+    from web_verifier.web_verifier import WebVerifier
+
+SECRET = "benchmark-secret-that-is-at-least-32-characters"
+SCENARIOS = ("single", "multi", "invalid", "replay")
+
+
+def sign(user_id: int, guild_id: int, secret: str = SECRET) -> str:
+    now = int(time.time())
+    payload = {
+        "user_id": str(user_id),
+        "username": f"user-{user_id}",
+        "guild_id": str(guild_id),
+        "member_id": str(user_id % 1000000),
+        "iat": now,
+        "exp": now + 1800,
+        "jti": uuid.uuid4().hex,
+    }
+    return jwt.encode(payload, secret, algorithm="HS256")
+
+
+async def build_cog(users: int, guilds_per_user: int, api_latency: float, keep_limits: bool):
+    """Create a WebVerifier whose users are each members of ``guilds_per_user`` enabled guilds."""
+    bot = FakeBot()
+    with fake_config():
+        cog = WebVerifier(bot)
+    await cog.config.jwt_secret.set(SECRET)
+    cog._jwt_secret = SECRET
+
+    guilds = []
+    for index in range(guilds_per_user):
+        guild = bot.add_guild(FakeGuild(f"guild-{index}"))
+        role = guild.add_role("Verified")
+        await cog.config.guild(guild).verification_enabled.set(True)
+        await cog.config.guild(guild).role_id.set(role.id)
+        guilds.append(guild)
+
+    user_ids = []
+    for _ in range(users):
+        member = guilds[0].add_member(api_latency=api_latency)
+        for guild in guilds[1:]:
+            guild.add_member(member.id, api_latency=api_latency)
+        user_ids.append(member.id)
+
+    await cog.load_guild_settings()
+    cog.build_membership_index()
+    # The executor paces role grants to Discord's per-route limits; lift them so the run measures the server
+    cog.role_executor.route_capacity = cog.role_executor.route_refill_per_second = 1e9
+    if not keep_limits:
+        # Replayed tokens repeat users past the per-user limit, and --concurrency can exceed max_in_flight
+        cog.ip_buckets.configure(0)
+        cog.user_buckets.configure(0)
+        cog._max_in_flight = 1000000
+    return cog, guilds[0], user_ids
+
+
+async def make_tokens(scenario: str, requests: int, guilds_per_user: int, api_latency: float, keep_limits: bool):
+    if scenario == "replay":
+        distinct = max(1, requests // 50)
+        cog, guild, user_ids = await build_cog(distinct, 1, api_latency, keep_limits)
+        originals = [sign(user_id, guild.id) for user_id in user_ids]
+        return cog, [originals[index % distinct] for index in range(requests)]
+
+    cog, guild, user_ids = await build_cog(requests, guilds_per_user if scenario == "multi" else 1, api_latency, keep_limits)
+    secret = "wrong-secret-that-is-also-at-least-32-characters" if scenario == "invalid" else SECRET
+    return cog, [sign(user_id, guild.id, secret) for user_id in user_ids]
+
+
+def percentile(sorted_values, pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * pct / 100))]
+
+
+async def run_scenario(scenario: str, args) -> None:
+    cog, tokens = await make_tokens(
+        scenario, args.requests, args.guilds_per_user, args.api_latency / 1000, args.keep_limits
+    )
+    server = TestServer(cog.build_web_app())
+    await server.start_server()
+    url = str(server.make_url("/discord-auth/return"))
+
+    queue: "asyncio.Queue[str]" = asyncio.Queue()
+    for token in tokens:
+        queue.put_nowait(token)
+    latencies = []
+    statuses = Counter()
+
+    async def client(session: aiohttp.ClientSession):
+        while True:
+            try:
+                token = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            start = time.perf_counter()
+            async with session.post(url, json={"jwt": token}) as response:
+                await response.read()
+                statuses[response.status] += 1
+            latencies.append(time.perf_counter() - start)
+
+    connector = aiohttp.TCPConnector(limit=args.concurrency)
+    async with aiohttp.ClientSession(connector=connector) as session:
+        start = time.perf_counter()
+        await asyncio.gather(*(client(session) for _ in range(args.concurrency)))
+        elapsed = time.perf_counter() - start
+    await server.close()
+
+    latencies.sort()
+    status_text = ", ".join(f"{status}x{count}" for status, count in sorted(statuses.items()))
+    print(
+        f"{scenario:>8}: {len(latencies) / elapsed:>9,.0f} req/s  "
+        f"p50 {percentile(latencies, 50) * 1000:7.2f}ms  "
+        f"p95 {percentile(latencies, 95) * 1000:7.2f}ms  "
+        f"p99 {percentile(latencies, 99) * 1000:7.2f}ms  "
+        f"[{status_text}]"
+    )
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=2000, help="Requests per scenario")
+    parser.add_argument("--concurrency", type=int, default=32, help="Concurrent clients")
+    parser.add_argument("--guilds-per-user", type=int, default=10, help="Guilds per user in the multi scenario")
+    parser.add_argument("--api-latency", type=float, default=0.0, help="Simulated Discord API latency in milliseconds")
+    parser.add_argument("--keep-limits", action="store_true", help="Keep the default overload limits to measure shedding")
+    parser.add_argument("--scenario", choices=SCENARIOS, action="append", help="Run only these scenarios")
+    args = parser.parse_args()
+
+    print(f"{args.requests} requests per scenario, {args.concurrency} concurrent clients")
+    for scenario in args.scenario or SCENARIOS:
+        await run_scenario(scenario, args)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
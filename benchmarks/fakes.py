@@ -0,0 +1,270 @@
+"""In-memory stand-ins for Red's Config and the discord.py objects the cogs touch.
+
+These are only used by the benchmarks in this directory. They implement the
+small part of each API the cogs call, and Config reads deep-copy like Red's
+drivers do, so the relative cost of a Config round-trip is preserved.
+"""
+import asyncio
+import copy
+import itertools
+from contextlib import contextmanager
+from typing import Any, Dict, List, Optional
+from unittest import mock
+
+from redbot.core import Config
+
+_ids = itertools.count(100000000000000000)
+
+
+def next_id() -> int:
+    return next(_ids)
+
+
+class _ValueContext:
+    def __init__(self, value: "FakeValue"):
+        self._value = value
+        self._data = None
+
+    def __await__(self):
+        return self._value._get().__await__()
+
+    async def __aenter__(self):
+        self._data = await self._value._get()
+        return self._data
+
+    async def __aexit__(self, *exc_info):
+        await self._value.set(self._data)
+
+
+class FakeValue:
+    def __init__(self, store: Dict[str, Any], key: str, default: Any):
+        self._store = store
+        self._key = key
+        self._default = default
+
+    async def _get(self):
+        await asyncio.sleep(0)  # Config reads always yield to the loop
+        return copy.deepcopy(self._store.get(self._key, self._default))
+
+    def __call__(self) -> _ValueContext:
+        return _ValueContext(self)
+
+    async def set(self, value: Any) -> None:
+        await asyncio.sleep(0)
+        self._store[self._key] = copy.deepcopy(value)
+
+    async def clear(self) -> None:
+        self._store.pop(self._key, None)
+
+
+class FakeGroup:
+    def __init__(self, data: Dict[str, Any], defaults: Dict[str, Any]):
+        self._data = data
+        self._defaults = defaults
+
+    def __getattr__(self, name: str) -> FakeValue:
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return FakeValue(self._data, name, self._defaults.get(name))
+
+    async def all(self) -> Dict[str, Any]:
+        await asyncio.sleep(0)
+        return copy.deepcopy({**self._defaults, **self._data})
+
+    async def set(self, value: Dict[str, Any]) -> None:
+        self._data.clear()
+        self._data.update(copy.deepcopy(value))
+
+    async def clear(self) -> None:
+        self._data.clear()
+
+
+class _FakeCustomRoot:
+    def __init__(self, store: Dict[str, Dict[str, Any]], defaults: Dict[str, Any]):
+        self._store = store
+        self._defaults = defaults
+
+    async def all(self) -> Dict[str, Dict[str, Any]]:
+        return {key: copy.deepcopy({**self._defaults, **data}) for key, data in self._store.items() if data}
+
+    async def set(self, value: Dict[str, Dict[str, Any]]) -> None:
+        self._store.clear()
+        self._store.update(copy.deepcopy(value))
+
+    async def clear(self) -> None:
+        self._store.clear()
+
+
+class FakeConfig:
+    """Dictionary-backed replacement for ``redbot.core.Config``."""
+
+    def __init__(self):
+        self._global_defaults: Dict[str, Any] = {}
+        self._globals: Dict[str, Any] = {}
+        self._guild_defaults: Dict[str, Any] = {}
+        self._guilds: Dict[int, Dict[str, Any]] = {}
+        self._custom_defaults: Dict[str, Dict[str, Any]] = {}
+        self._custom: Dict[str, Dict[str, Dict[str, Any]]] = {}
+
+    def register_global(self, **defaults) -> None:
+        self._global_defaults.update(defaults)
+
+    def register_guild(self, **defaults) -> None:
+        self._guild_defaults.update(defaults)
+
+    def init_custom(self, group: str, identifier_count: int) -> None:
+        self._custom.setdefault(group, {})
+
+    def register_custom(self, group: str, **defaults) -> None:
+        self._custom_defaults.setdefault(group, {}).update(defaults)
+
+    def __getattr__(self, name: str) -> FakeValue:
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return FakeValue(self._globals, name, self._global_defaults.get(name))
+
+    def guild(self, guild) -> FakeGroup:
+        return FakeGroup(self._guilds.setdefault(guild.id, {}), self._guild_defaults)
+
+    async def all_guilds(self) -> Dict[int, Dict[str, Any]]:
+        return {
+            guild_id: copy.deepcopy({**self._guild_defaults, **data})
+            for guild_id, data in self._guilds.items()
+            if data
+        }
+
+    def custom(self, group: str, *identifiers: str):
+        store = self._custom.setdefault(group, {})
+        defaults = self._custom_defaults.get(group, {})
+        if not identifiers:
+            return _FakeCustomRoot(store, defaults)
+        return FakeGroup(store.setdefault(str(identifiers[0]), {}), defaults)
+
+
+@contextmanager
+def fake_config():
+    """Make ``Config.get_conf`` hand out a fresh FakeConfig while constructing a cog."""
+    with mock.patch.object(Config, "get_conf", side_effect=lambda *args, **kwargs: FakeConfig()):
+        yield
+
+
+class FakeRole:
+    def __init__(self, name: str = "Verified", role_id: Optional[int] = None):
+        self.id = role_id or next_id()
+        self.name = name
+
+    def __eq__(self, other):
+        return isinstance(other, FakeRole) and other.id == self.id
+
+    def __hash__(self):
+        return hash(self.id)
+
+
+class FakeMember:
+    def __init__(self, guild: "FakeGuild", user_id: Optional[int] = None, name: str = "member", roles=(), api_latency: float = 0.0):
+        self.id = user_id or next_id()
+        self.guild = guild
+        self.name = name
+        self.display_name = name
+        self.mention = f"<@{self.id}>"
+        self.roles: List[FakeRole] = list(roles)
+        self.api_latency = api_latency
+        self.sent: List[str] = []
+
+    def __str__(self):
+        return self.name
+
+    def get_role(self, role_id: int) -> Optional[FakeRole]:
+        for role in self.roles:
+            if role.id == role_id:
+                return role
+        return None
+
+    def copy_with(self, **changes) -> "FakeMember":
+        clone = copy.copy(self)
+        clone.roles = list(self.roles)
+        clone.__dict__.update(changes)
+        return clone
+
+    async def add_roles(self, *roles, reason=None):
+        await asyncio.sleep(self.api_latency)
+        for role in roles:
+            if role not in self.roles:
+                self.roles.append(role)
+
+    async def remove_roles(self, *roles, reason=None):
+        await asyncio.sleep(self.api_latency)
+        self.roles = [role for role in self.roles if role not in roles]
+
+    async def send(self, content=None, **kwargs):
+        await asyncio.sleep(self.api_latency)
+        self.sent.append(content)
+
+    async def kick(self, reason=None):
+        await asyncio.sleep(self.api_latency)
+        self.guild._members.pop(self.id, None)
+
+
+class FakeGuild:
+    def __init__(self, name: str = "guild", guild_id: Optional[int] = None):
+        self.id = guild_id or next_id()
+        self.name = name
+        self.roles: List[FakeRole] = []
+        self._members: Dict[int, FakeMember] = {}
+        self.system_channel = None
+
+    @property
+    def members(self) -> List[FakeMember]:
+        return list(self._members.values())
+
+    def get_member(self, user_id: int) -> Optional[FakeMember]:
+        return self._members.get(user_id)
+
+    def get_role(self, role_id: int) -> Optional[FakeRole]:
+        for role in self.roles:
+            if role.id == role_id:
+                return role
+        return None
+
+    def get_channel(self, channel_id: int):
+        return None
+
+    def add_role(self, name: str = "Verified") -> FakeRole:
+        role = FakeRole(name)
+        self.roles.append(role)
+        return role
+
+    def add_member(self, user_id: Optional[int] = None, **kwargs) -> FakeMember:
+        member = FakeMember(self, user_id, **kwargs)
+        self._members[member.id] = member
+        return member
+
+
+class FakeBot:
+    def __init__(self):
+        self._guilds: Dict[int, FakeGuild] = {}
+        self.dispatched = 0
+
+    @property
+    def guilds(self) -> List[FakeGuild]:
+        return list(self._guilds.values())
+
+    def add_guild(self, guild: FakeGuild) -> FakeGuild:
+        self._guilds[guild.id] = guild
+        return guild
+
+    def get_guild(self, guild_id: int) -> Optional[FakeGuild]:
+        return self._guilds.get(guild_id)
+
+    def get_user(self, user_id: int):
+        return None
+
+    def dispatch(self, event: str, *args) -> None:
+        self.dispatched += 1
+
+    async def wait_until_red_ready(self) -> None:
+        return
+
+    async def get_prefix(self, message) -> List[str]:
+        return ["!"]
+
@@ -0,0 +1,122 @@
+import asyncio
+import heapq
+import itertools
+import logging
+import time
+from collections import deque
+from typing import Awaitable, Callable, Deque, List, Optional, Set, Tuple
+
+import discord
+
+log = logging.getLogger("red.reediculous-cogs.verifier.admission")
+
+RAID_WINDOW = 10  # Seconds of joins used to compute the join rate
+RAID_COOLDOWN = 60  # Seconds raid mode stays on after the join rate drops
+WAIT_SAMPLES = 100  # Recent queue waits kept for the status command
+
+SessionRunner = Callable[[discord.Member, discord.abc.Messageable], Awaitable[None]]
+
+
+class GuildAdmission:
+    """Admission queue for one guild's verification sessions.
+
+    Joiners are queued and at most ``max_sessions`` question sessions run at
+    once. When joins arrive faster than ``raid_joins_per_second`` over the
+    last ``RAID_WINDOW`` seconds the guild enters raid mode and the cap drops
+    to ``raid_max_sessions`` until the rate has stayed low for
+    ``RAID_COOLDOWN`` seconds. Queued members are admitted oldest account
+    first, so established users are not stuck behind a wave of fresh ones.
+    """
+
+    def __init__(self, guild_id: int, runner: SessionRunner, max_sessions: int, raid_joins_per_second: float, raid_max_sessions: int):
+        self.guild_id = guild_id
+        self.runner = runner
+        self.max_sessions = max_sessions
+        self.raid_joins_per_second = raid_joins_per_second
+        self.raid_max_sessions = raid_max_sessions
+        self.active = 0
+        self.raid_until = 0.0
+        self.raid_started: Optional[float] = None
+        self._heap: List[Tuple[float, int, float, discord.Member, discord.abc.Messageable]] = []
+        self._seq = itertools.count()
+        self._joins: Deque[float] = deque()
+        self._waits: Deque[float] = deque(maxlen=WAIT_SAMPLES)
+        self._tasks: Set[asyncio.Task] = set()
+
+    def configure(self, max_sessions: int, raid_joins_per_second: float, raid_max_sessions: int) -> None:
+        self.max_sessions = max_sessions
+        self.raid_joins_per_second = raid_joins_per_second
+        self.raid_max_sessions = raid_max_sessions
+        self._pump()
+
+    @property
+    def raiding(self) -> bool:
+        return time.monotonic() < self.raid_until
+
+    @property
+    def capacity(self) -> int:
+        return self.raid_max_sessions if self.raiding else self.max_sessions
+
+    @property
+    def depth(self) -> int:
+        return len(self._heap)
+
+    def join_rate(self) -> float:
+        now = time.monotonic()
+        while self._joins and self._joins[0] <= now - RAID_WINDOW:
+            self._joins.popleft()
+        return len(self._joins) / RAID_WINDOW
+
+    def record_join(self) -> None:
+        """Count a join towards the join rate and enter or extend raid mode."""
+        now = time.monotonic()
+        self._joins.append(now)
+        if self.join_rate() < self.raid_joins_per_second:
+            return
+        if not self.raiding:
+            self.raid_started = now
+            log.warning(f"Join raid detected in guild {self.guild_id}, limiting verification to {self.raid_max_sessions} session(s)")
+        self.raid_until = now + RAID_COOLDOWN
+
+    def submit(self, member: discord.Member, channel: discord.abc.Messageable) -> None:
+        """Queue a verification session for a member."""
+        created = member.created_at.timestamp()
+        heapq.heappush(self._heap, (created, next(self._seq), time.monotonic(), member, channel))
+        self._pump()
+
+    def oldest_wait(self) -> float:
+        if not self._heap:
+            return 0.0
+        return time.monotonic() - min(item[2] for item in self._heap)
+
+    def recent_waits(self) -> Tuple[float, float]:
+        """Return the mean and maximum of recent queue waits in seconds."""
+        if not self._waits:
+            return 0.0, 0.0
+        return sum(self._waits) / len(self._waits), max(self._waits)
+
+    def _pump(self) -> None:
+        while self._heap and self.active < self.capacity:
+            _, _, enqueued, member, channel = heapq.heappop(self._heap)
+            self._waits.append(time.monotonic() - enqueued)
+            self.active += 1
+            task = asyncio.create_task(self._run(member, channel))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, member: discord.Member, channel: discord.abc.Messageable) -> None:
+        try:
+            await self.runner(member, channel)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            log.error(f"Verification session for {member} ({member.id}) failed: {e}", exc_info=True)
+        finally:
+            self.active -= 1
+            self._pump()
+
+    def cancel(self) -> None:
+        """Drop queued members and cancel running sessions."""
+        self._heap.clear()
+        for task in list(self._tasks):
+            task.cancel()
@@ -0,0 +1,113 @@
+import asyncio
+import heapq
+import itertools
+from typing import List, Optional
+
+RESOLUTION = 0.25  # Deadlines are rounded up to this many seconds so nearby ones expire together
+
+
+class Deadline:
+    """A timeout armed on a future; cancel it once the future no longer needs one."""
+
+    __slots__ = ("scheduler", "when", "future", "armed")
+
+    def __init__(self, scheduler: "DeadlineScheduler", when: float, future: asyncio.Future):
+        self.scheduler = scheduler
+        self.when = when
+        self.future = future
+        self.armed = True
+
+    def cancel(self) -> None:
+        if self.armed:
+            self.armed = False
+            self.scheduler._disarm()
+
+
+class DeadlineScheduler:
+    """Expires verification timeouts from one heap and one timer.
+
+    ``asyncio.wait_for`` schedules a timer handle and a wrapper task for every
+    wait, so a raid of queued question sessions keeps thousands of them
+    alive. Here each wait is a heap entry; a single ``call_at`` handle fires
+    at the earliest deadline and fails every due future with
+    ``asyncio.TimeoutError`` in one pass. Cancelled deadlines are left in the
+    heap and skipped, and the heap is compacted once most of it is cancelled.
+    """
+
+    def __init__(self, resolution: float = RESOLUTION):
+        self.resolution = resolution
+        self._heap: List[tuple] = []
+        self._counter = itertools.count()
+        self._armed = 0
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._timer_at = 0.0
+
+    def arm(self, future: asyncio.Future, timeout: float) -> Deadline:
+        """Fail ``future`` with ``asyncio.TimeoutError`` if it is still pending after ``timeout`` seconds."""
+        loop = asyncio.get_running_loop()
+        when = loop.time() + timeout
+        when = -(-when // self.resolution) * self.resolution
+        deadline = Deadline(self, when, future)
+        heapq.heappush(self._heap, (when, next(self._counter), deadline))
+        self._armed += 1
+        if self._timer is None or when < self._timer_at:
+            self._schedule(loop, when)
+        return deadline
+
+    async def wait(self, future: asyncio.Future, timeout: float):
+        """Await ``future`` with a timeout, like ``asyncio.wait_for`` without a task per wait."""
+        deadline = self.arm(future, timeout)
+        try:
+            return await future
+        finally:
+            deadline.cancel()
+
+    def _schedule(self, loop: asyncio.AbstractEventLoop, when: float) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+        self._timer = loop.call_at(when, self._expire)
+        self._timer_at = when
+
+    def _disarm(self) -> None:
+        self._armed -= 1
+        if len(self._heap) > 64 and self._armed < len(self._heap) // 2:
+            self._heap = [entry for entry in self._heap if entry[2].armed]
+            heapq.heapify(self._heap)
+
+    def _expire(self) -> None:
+        self._timer = None
+        loop = asyncio.get_running_loop()
+        now = loop.time()
+        heap = self._heap
+        while heap and heap[0][0] <= now:
+            deadline = heapq.heappop(heap)[2]
+            if not deadline.armed:
+                continue
+            deadline.armed = False
+            self._armed -= 1
+            if not deadline.future.done():
+                deadline.future.set_exception(asyncio.TimeoutError())
+        while heap and not heap[0][2].armed:
+            heapq.heappop(heap)
+        if heap:
+            self._schedule(loop, heap[0][0])
+
+    def close(self) -> None:
+        """Stop the timer and cancel every future still waiting on a deadline.
+
+        Nothing would expire them afterwards, so sessions waiting on an answer
+        get ``asyncio.CancelledError`` instead of hanging.
+        """
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        heap, self._heap = self._heap, []
+        for _, _, deadline in heap:
+            if deadline.armed:
+                deadline.armed = False
+                deadline.future.cancel()
+        self._armed = 0
+
+    def __len__(self) -> int:
+        """Number of armed deadlines."""
+        return self._armed
@@ -0,0 +1,135 @@
+import asyncio
+import logging
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Sequence
+
+log = logging.getLogger("red.reediculous-cogs.verifier.funnel")
+
+RING_SIZE = 500  # Latency samples kept per series
+OUTCOMES = ("pass", "fail", "timeout")
+
+
+def percentile(samples: Sequence[float], pct: float) -> float:
+    """Nearest-rank percentile of ``samples``; 0 when there are none."""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+class GuildFunnel:
+    """One guild's verification funnel: latency rings and outcome counters."""
+
+    __slots__ = ("dm_open", "answers", "outcomes", "dms_opened", "dms_forbidden")
+
+    def __init__(self, data: Optional[Dict[str, Any]] = None):
+        data = data or {}
+        self.dm_open: Deque[float] = deque(data.get("dm_open", []), maxlen=RING_SIZE)
+        # Keyed by question position in the session; Config stores the keys as strings
+        self.answers: Dict[int, Deque[float]] = {
+            int(index): deque(samples, maxlen=RING_SIZE) for index, samples in data.get("answers", {}).items()
+        }
+        self.outcomes: Dict[int, List[int]] = {
+            int(index): list(counts) for index, counts in data.get("outcomes", {}).items()
+        }
+        self.dms_opened = data.get("dms_opened", 0)
+        self.dms_forbidden = data.get("dms_forbidden", 0)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "dm_open": list(self.dm_open),
+            "answers": {str(index): list(samples) for index, samples in self.answers.items()},
+            "outcomes": {str(index): counts for index, counts in self.outcomes.items()},
+            "dms_opened": self.dms_opened,
+            "dms_forbidden": self.dms_forbidden,
+        }
+
+    @property
+    def forbidden_rate(self) -> float:
+        attempts = self.dms_opened + self.dms_forbidden
+        return self.dms_forbidden / attempts if attempts else 0.0
+
+
+class FunnelStats:
+    """Write-buffered verification funnel for every guild.
+
+    Recording a sample is a deque append or a list increment and marks the
+    guild dirty; dirty guilds are written to their ``funnel`` config key every
+    ``flush_interval`` seconds and when the cog unloads.
+    """
+
+    def __init__(self, config, *, flush_interval: float = 60):
+        self.config = config
+        self.flush_interval = flush_interval
+        self.guilds: Dict[int, GuildFunnel] = {}
+        self._dirty = set()
+        self._flush_lock = asyncio.Lock()
+        self._loop_task: Optional[asyncio.Task] = None
+
+    async def start(self) -> None:
+        """Load the stored funnels and start the periodic flush."""
+        for guild_id, data in (await self.config.all_guilds()).items():
+            if data.get("funnel"):
+                self.guilds[guild_id] = GuildFunnel(data["funnel"])
+        self._loop_task = asyncio.create_task(self._flush_loop())
+
+    async def stop(self) -> None:
+        """Stop the periodic flush and write out anything still pending."""
+        if self._loop_task:
+            self._loop_task.cancel()
+        await self.flush()
+
+    def get(self, guild_id: int) -> GuildFunnel:
+        funnel = self.guilds.get(guild_id)
+        if funnel is None:
+            funnel = self.guilds[guild_id] = GuildFunnel()
+        return funnel
+
+    def record_dm_open(self, guild_id: int, seconds: float) -> None:
+        funnel = self.get(guild_id)
+        funnel.dm_open.append(seconds)
+        funnel.dms_opened += 1
+        self._dirty.add(guild_id)
+
+    def record_forbidden(self, guild_id: int) -> None:
+        self.get(guild_id).dms_forbidden += 1
+        self._dirty.add(guild_id)
+
+    def record_answer(self, guild_id: int, index: int, outcome: str, seconds: Optional[float] = None) -> None:
+        """Count a question's outcome; timeouts have no answer latency."""
+        funnel = self.get(guild_id)
+        counts = funnel.outcomes.get(index)
+        if counts is None:
+            counts = funnel.outcomes[index] = [0] * len(OUTCOMES)
+        counts[OUTCOMES.index(outcome)] += 1
+        if seconds is not None:
+            samples = funnel.answers.get(index)
+            if samples is None:
+                samples = funnel.answers[index] = deque(maxlen=RING_SIZE)
+            samples.append(seconds)
+        self._dirty.add(guild_id)
+
+    async def reset(self, guild_id: int) -> None:
+        async with self._flush_lock:
+            self.guilds.pop(guild_id, None)
+            self._dirty.discard(guild_id)
+            await self.config.guild_from_id(guild_id).funnel.clear()
+
+    async def flush(self) -> None:
+        """Write the funnel of every guild that recorded samples since the last flush."""
+        async with self._flush_lock:
+            dirty, self._dirty = self._dirty, set()
+            for guild_id in dirty:
+                funnel = self.guilds.get(guild_id)
+                if funnel is None:
+                    continue
+                try:
+                    await self.config.guild_from_id(guild_id).funnel.set(funnel.to_dict())
+                except Exception as e:
+                    log.error(f"Error flushing verification funnel for guild {guild_id}: {e}", exc_info=True)
+                    self._dirty.add(guild_id)
+
+    async def _flush_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            await self.flush()
@@ -0,0 +1,155 @@
+import asyncio
+import heapq
+import logging
+import time
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+import discord
+
+log = logging.getLogger("red.reediculous-cogs.verifier.prune")
+
+KICK_INTERVAL = 1.0  # Seconds between prune kicks, to stay well inside Discord's rate limits
+PERMISSION_RETRY = 600  # Seconds before retrying a prune that failed for lack of Kick Members
+
+
+class PrunePolicy(NamedTuple):
+    hours: float
+    role_id: int
+    since: float  # Unix time the policy took effect; nobody's window starts before it
+    existing: bool  # Whether members who joined before ``since`` are covered
+
+
+def unverified_members(guild: discord.Guild, role_id: int, joined_before: float) -> List[discord.Member]:
+    """Members who joined before ``joined_before`` and lack the verified role."""
+    return [
+        member for member in guild.members
+        if not member.bot and member.joined_at is not None
+        and member.joined_at.timestamp() < joined_before and member.get_role(role_id) is None
+    ]
+
+
+def policy_from_config(config: dict) -> Optional[PrunePolicy]:
+    """The guild's active policy; pruning is paused while verification is disabled or no role is set."""
+    if not config.get("prune_hours") or not config.get("verification_enabled") or not config.get("role_id"):
+        return None
+    return PrunePolicy(config["prune_hours"], config["role_id"], config.get("prune_since", 0), config.get("prune_existing", False))
+
+
+class PruneScheduler:
+    """Kicks members who have not verified within a guild's prune window.
+
+    A member's deadline is ``max(joined_at, since) + hours``, so turning a
+    policy on never kicks anyone before a full window has passed, and members
+    who joined before it are only covered when the admin opted them in. Join
+    deadlines sit in one min-heap shared by every guild and a single task
+    sleeps until the earliest one. Members who verified or left in the
+    meantime are skipped when their deadline comes up, so nothing has to be
+    removed from the heap. The heap is not stored: on start it is rebuilt
+    from the ``joined_at`` of each unverified member.
+    """
+
+    def __init__(self, bot, config):
+        self.bot = bot
+        self.config = config
+        self.policies: Dict[int, PrunePolicy] = {}
+        self._heap: List[Tuple[float, int, int]] = []  # (deadline, guild_id, member_id)
+        self._wake = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self.kicked: Dict[int, int] = {}  # guild_id -> members pruned since the cog loaded
+
+    def start(self) -> None:
+        self._task = asyncio.create_task(self._run())
+
+    def cancel(self) -> None:
+        if self._task:
+            self._task.cancel()
+
+    def configure(self, guild: discord.Guild, policy: Optional[PrunePolicy]) -> None:
+        """Apply a guild's policy; a new or changed policy re-queues the members it covers."""
+        if policy is None:
+            self.policies.pop(guild.id, None)
+            return
+        if self.policies.get(guild.id) == policy:
+            return
+        self.policies[guild.id] = policy
+        for member in guild.members:
+            self.track(member)
+
+    @staticmethod
+    def deadline(member: discord.Member, policy: PrunePolicy) -> Optional[float]:
+        """When the member is due to be pruned, or None if the policy does not cover them."""
+        if member.bot or member.joined_at is None or member.get_role(policy.role_id) is not None:
+            return None
+        joined = member.joined_at.timestamp()
+        if joined < policy.since and not policy.existing:
+            return None
+        return max(joined, policy.since) + policy.hours * 3600
+
+    def track(self, member: discord.Member) -> None:
+        """Queue a member's prune deadline if their guild's policy covers them."""
+        policy = self.policies.get(member.guild.id)
+        deadline = self.deadline(member, policy) if policy else None
+        if deadline is not None:
+            self._push(deadline, member.guild.id, member.id)
+
+    def _push(self, deadline: float, guild_id: int, member_id: int) -> None:
+        if not self._heap or deadline < self._heap[0][0]:
+            self._wake.set()
+        heapq.heappush(self._heap, (deadline, guild_id, member_id))
+
+    @property
+    def pending(self) -> int:
+        """Queued deadlines, including ones for members who have since verified or left."""
+        return len(self._heap)
+
+    def pending_for(self, guild_id: int) -> int:
+        return sum(1 for _, entry_guild_id, _ in self._heap if entry_guild_id == guild_id)
+
+    async def _run(self) -> None:
+        await self.bot.wait_until_red_ready()
+        for guild_id, data in (await self.config.all_guilds()).items():
+            guild = self.bot.get_guild(guild_id)
+            if guild is not None:
+                self.configure(guild, policy_from_config(data))
+        if self._heap:
+            log.info(f"Rebuilt {len(self._heap)} prune deadline(s)")
+
+        while True:
+            self._wake.clear()
+            if not self._heap:
+                await self._wake.wait()
+                continue
+            delay = self._heap[0][0] - time.time()
+            if delay > 0:
+                try:
+                    await asyncio.wait_for(self._wake.wait(), delay)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            _, guild_id, member_id = heapq.heappop(self._heap)
+            if await self._prune(guild_id, member_id):
+                await asyncio.sleep(KICK_INTERVAL)
+
+    async def _prune(self, guild_id: int, member_id: int) -> bool:
+        """Kick the member if they are still unverified past the current policy; return whether a kick was sent."""
+        policy = self.policies.get(guild_id)
+        guild = self.bot.get_guild(guild_id)
+        member = guild.get_member(member_id) if guild else None
+        deadline = self.deadline(member, policy) if policy and member else None
+        if deadline is None:
+            return False
+        if deadline > time.time():
+            # The window was lengthened or restarted since this deadline was queued
+            self._push(deadline, guild_id, member_id)
+            return False
+        if not guild.me.guild_permissions.kick_members:
+            # Keep the member queued so they are pruned once the permission is granted
+            self._push(time.time() + PERMISSION_RETRY, guild_id, member_id)
+            return False
+        try:
+            await member.kick(reason=f"Did not verify within {policy.hours:g} hour(s) of joining")
+        except discord.HTTPException as e:
+            log.warning(f"Could not prune member {member_id} from guild {guild_id}: {e}")
+            return True
+        self.kicked[guild_id] = self.kicked.get(guild_id, 0) + 1
+        return True
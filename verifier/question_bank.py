@@ -0,0 +1,87 @@
+import json
+from typing import Any, Dict, FrozenSet, List, Tuple
+
+from .answers import compile_answers
+
+try:
+    import yaml
+except ImportError:  # YAML support is optional; JSON always works
+    yaml = None
+
+MAX_BANK_SIZE = 1024 * 1024  # Largest question bank attachment accepted, in bytes
+
+CompiledQuestion = Tuple[Dict[str, Any], FrozenSet[str]]
+
+
+def bank_format(filename: str) -> str:
+    """Pick the file format from an attachment's extension."""
+    return "yaml" if filename.lower().endswith((".yaml", ".yml")) else "json"
+
+
+def parse_question_bank(text: str, file_format: str) -> Tuple[List[CompiledQuestion], List[str]]:
+    """Parse and validate a whole question bank.
+
+    The bank is a list of ``{"question": str, "answers": [str], "sticky": bool}``
+    objects, or an object with that list under ``questions``. Returns the
+    questions paired with their normalized answer sets and every problem
+    found; the bank should only be applied when there are no problems.
+    """
+    try:
+        if file_format == "yaml":
+            if yaml is None:
+                return [], ["YAML files need PyYAML installed on the bot; use JSON instead."]
+            data = yaml.safe_load(text)
+        else:
+            data = json.loads(text)
+    except (ValueError, getattr(yaml, "YAMLError", ValueError)) as e:
+        return [], [f"The file is not valid {file_format.upper()}: {e}"]
+
+    if isinstance(data, dict):
+        data = data.get("questions")
+    if not isinstance(data, list):
+        return [], ["The file must contain a list of questions, or an object with a `questions` list."]
+
+    compiled = []
+    errors = []
+    seen = set()
+    for number, item in enumerate(data, start=1):
+        if not isinstance(item, dict):
+            errors.append(f"Question {number}: must be an object with `question` and `answers`.")
+            continue
+        question = item.get("question")
+        answers = item.get("answers")
+        sticky = item.get("sticky", False)
+        if isinstance(answers, str):
+            answers = [answers]
+        if not isinstance(question, str) or not question.strip():
+            errors.append(f"Question {number}: `question` must be non-empty text.")
+            continue
+        if question in seen:
+            errors.append(f"Question {number}: duplicate of an earlier question.")
+            continue
+        seen.add(question)
+        if not isinstance(answers, list) or not answers or not all(isinstance(answer, str) for answer in answers):
+            errors.append(f"Question {number}: `answers` must be a non-empty list of text.")
+            continue
+        if not isinstance(sticky, bool):
+            errors.append(f"Question {number}: `sticky` must be true or false.")
+            continue
+        accepted = compile_answers(answers) - {""}
+        if not accepted:
+            errors.append(f"Question {number}: no answer contains letters or numbers, so none could ever match.")
+            continue
+        compiled.append(({"question": question, "answers": list(answers), "sticky": sticky}, accepted))
+    return compiled, errors
+
+
+def dump_question_bank(questions: List[Dict[str, Any]], file_format: str) -> str:
+    """Serialize questions in the format ``parse_question_bank`` reads."""
+    bank = {
+        "questions": [
+            {"question": q["question"], "answers": list(q["answers"]), "sticky": bool(q.get("sticky", False))}
+            for q in questions
+        ]
+    }
+    if file_format == "yaml":
+        return yaml.safe_dump(bank, allow_unicode=True, sort_keys=False)
+    return json.dumps(bank, indent=2, ensure_ascii=False) + "\n"
@@ -0,0 +1,107 @@
+import asyncio
+import logging
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+log = logging.getLogger("red.reediculous-cogs.verifier.sessions")
+
+SESSION_GROUP = "VERIFICATION_SESSION"
+QUEUED_FLUSH_DELAY = 1.0  # Seconds queued-member records are collected before they are written
+
+SESSION_DEFAULTS = {
+    "guild_id": None,
+    "user_id": None,
+    "channel_id": None,
+    "questions": [],  # Text of each question picked for the session, in order
+    "index": 0,  # Position of the question currently waiting for an answer
+    "deadline": 0,  # Unix time the current question times out
+}
+
+
+def session_key(guild_id: int, user_id: int) -> str:
+    return f"{guild_id}-{user_id}"
+
+
+class SessionStore:
+    """Persists the progress of in-flight question sessions.
+
+    Each session is one key in the ``VERIFICATION_SESSION`` custom Config
+    group, written when a question is sent and cleared when the session ends,
+    so a reload or restart can continue from the question that was waiting.
+
+    Records for members still waiting in the admission queue are handed to
+    ``queue`` instead, which returns at once; they are written in the
+    background every ``QUEUED_FLUSH_DELAY`` seconds and on ``flush``, so a
+    join raid does not put a Config write in front of every admission.
+    """
+
+    def __init__(self, config):
+        self.config = config
+        self._queued: Dict[str, Dict[str, Any]] = {}
+        self._flush_task: Optional[asyncio.Task] = None
+        self._write_lock = asyncio.Lock()  # Keeps a background write from landing after a newer one for the same key
+
+    def queue(self, record: Dict[str, Any]) -> None:
+        """Store a queued member's record soon, without waiting for the write."""
+        self._queued[session_key(record["guild_id"], record["user_id"])] = record
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.create_task(self._flush_later())
+
+    async def _flush_later(self) -> None:
+        await asyncio.sleep(QUEUED_FLUSH_DELAY)
+        await self.flush()
+
+    async def stop(self) -> None:
+        """Cancel the pending background write and write everything still queued."""
+        if self._flush_task:
+            self._flush_task.cancel()
+        await self.flush()
+
+    async def flush(self) -> None:
+        """Write every queued-member record that is still pending."""
+        while self._queued:
+            key, record = self._queued.popitem()
+            async with self._write_lock:
+                try:
+                    await self.config.custom(SESSION_GROUP, key).set(record)
+                except Exception as e:
+                    log.error(f"Error saving queued verification session {key}: {e}", exc_info=True)
+
+    async def save(self, record: Dict[str, Any]) -> None:
+        key = session_key(record["guild_id"], record["user_id"])
+        self._queued.pop(key, None)
+        async with self._write_lock:
+            await self.config.custom(SESSION_GROUP, key).set(record)
+
+    async def discard(self, guild_id: int, user_id: int) -> None:
+        key = session_key(guild_id, user_id)
+        self._queued.pop(key, None)
+        async with self._write_lock:
+            await self.config.custom(SESSION_GROUP, key).clear()
+
+    async def discard_user(self, user_id: int) -> None:
+        """Drop a user's sessions in every guild."""
+        stored = await self.config.custom(SESSION_GROUP).all()
+        for key, record in stored.items():
+            if record.get("user_id") == user_id:
+                await self.config.custom(SESSION_GROUP, key).clear()
+
+    async def load(self) -> Tuple[List[Dict[str, Any]], int]:
+        """Return the live sessions and clear the expired ones.
+
+        Only the expired keys are cleared, so records saved while this runs
+        are kept.
+        """
+        stored = await self.config.custom(SESSION_GROUP).all()
+        now = time.time()
+        live = []
+        expired = 0
+        for key, record in stored.items():
+            if record.get("deadline", 0) > now:
+                live.append({**SESSION_DEFAULTS, **record})
+            else:
+                await self.config.custom(SESSION_GROUP, key).clear()
+                expired += 1
+        if expired:
+            log.info(f"Dropped {expired} expired verification session(s)")
+        return live, expired
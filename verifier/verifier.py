@@ -1,11 +1,28 @@
 import discord
 import asyncio
-import re
+import io
+import time
 import random
+import logging
 from redbot.core import commands, Config
 from redbot.core.bot import Red
+from redbot.core.utils.predicates import MessagePredicate
 from discord.utils import get
 
+from .admission import GuildAdmission
+from .answers import compile_answers, normalize_answer
+from .dm_router import DMRouter
+from .funnel import OUTCOMES, FunnelStats, percentile
+from .prune import PruneScheduler, policy_from_config, unverified_members
+from .question_bank import MAX_BANK_SIZE, bank_format, dump_question_bank, parse_question_bank, yaml
+from .sessions import SESSION_DEFAULTS, SESSION_GROUP, SessionStore
+
+log = logging.getLogger("red.reediculous-cogs.verifier")
+
+ANSWER_TIMEOUT = 90  # Seconds to answer each question
+RESUME_GRACE = 30  # Minimum seconds to answer the question a resumed session repeats
+QUEUED_SESSION_TTL = 86400  # Seconds a stored session for a member still waiting in the admission queue is kept
+
 class Verifier(commands.Cog):
     """A cog that handles user verification with questions."""
 
@@ -22,9 +39,85 @@ class Verifier(commands.Cog):
             "role_id": None,
             "kick_on_fail": False,
             "verification_enabled": False,
-            "num_questions_to_ask": None
+            "num_questions_to_ask": None,
+            "max_sessions": 10,
+            "raid_joins_per_second": 2.0,
+            "raid_max_sessions": 3,
+            "funnel": {},
+            "prune_hours": None,
+            "prune_since": 0,  # Unix time the prune window started; nobody is pruned sooner than prune_hours after it
+            "prune_existing": False  # Whether members who joined before prune_since are pruned too
         }
         self.config.register_guild(**default_guild)
+        self.config.init_custom(SESSION_GROUP, 1)
+        self.config.register_custom(SESSION_GROUP, **SESSION_DEFAULTS)
+        self.session_store = SessionStore(self.config)
+        self._resumable = {}  # (guild_id, user_id) -> stored session waiting for an admission slot
+        self._resume_task = None
+        self.admissions = {}
+        self._question_cache = {}  # guild_id -> [(question, normalized accepted answers)]
+        self.dm_router = DMRouter()
+        self.funnel = FunnelStats(self.config)
+        self.pruner = PruneScheduler(self.bot, self.config)
+
+    async def cog_load(self):
+        """Continue the sessions that were in flight when the cog was last unloaded."""
+        await self.funnel.start()
+        self._resume_task = asyncio.create_task(self.resume_sessions())
+        self.pruner.start()
+
+    async def cog_unload(self):
+        """Cancel queued and running verification sessions when the cog unloads.
+
+        Their stored progress is kept, so they continue on the next load.
+        """
+        if self._resume_task:
+            self._resume_task.cancel()
+        self.pruner.cancel()
+        for admission in self.admissions.values():
+            admission.cancel()
+        self.dm_router.deadlines.close()
+        await self.session_store.stop()
+        await self.funnel.stop()
+
+    async def resume_sessions(self):
+        """Queue every stored, unexpired session once the member cache is ready."""
+        await self.bot.wait_until_red_ready()
+        sessions, _ = await self.session_store.load()
+        resumed = 0
+        for record in sessions:
+            guild = self.bot.get_guild(record["guild_id"])
+            member = guild.get_member(record["user_id"]) if guild else None
+            config = await self.config.guild(guild).all() if member else None
+            if not config or not config["verification_enabled"]:
+                await self.session_store.discard(record["guild_id"], record["user_id"])
+                continue
+            channel = guild.get_channel(record["channel_id"]) or guild.system_channel
+            self._resumable[(guild.id, member.id)] = record
+            self.get_admission(guild, config).submit(member, channel)
+            resumed += 1
+        if resumed:
+            log.info(f"Resuming {resumed} verification session(s)")
+
+    def get_admission(self, guild: discord.Guild, config: dict) -> GuildAdmission:
+        """Return the guild's admission queue, applying the latest limits from its config."""
+        admission = self.admissions.get(guild.id)
+        if admission is None:
+            admission = self.admissions[guild.id] = GuildAdmission(
+                guild.id, self.run_admitted_session,
+                config["max_sessions"], config["raid_joins_per_second"], config["raid_max_sessions"]
+            )
+        else:
+            admission.configure(config["max_sessions"], config["raid_joins_per_second"], config["raid_max_sessions"])
+        return admission
+
+    async def run_admitted_session(self, member: discord.Member, channel: discord.TextChannel):
+        resume = self._resumable.pop((member.guild.id, member.id), None)
+        # Members can leave while queued; don't DM them
+        if member.guild.get_member(member.id) is None:
+            await self.session_store.discard(member.guild.id, member.id)
+            return
+        await self.ask_questions(member, member.guild, channel, resume=resume)
 
     async def get_prefix(self, member: discord.Member):
         # Retrieve the prefix for the guild
@@ -35,12 +128,24 @@ class Verifier(commands.Cog):
 
     def normalize_answer(self, answer: str):
         # Remove non-alphanumeric characters and convert to lowercase
-        return re.sub(r'[^a-zA-Z0-9]', '', answer).lower()
+        return normalize_answer(answer)
+
+    def compiled_questions(self, guild: discord.Guild, questions: list):
+        """Return the guild's questions paired with their normalized answer sets, compiling them once."""
+        compiled = self._question_cache.get(guild.id)
+        if compiled is None:
+            compiled = self._question_cache[guild.id] = [(q, compile_answers(q["answers"])) for q in questions]
+        return compiled
 
-    async def ask_questions(self, member: discord.Member, guild: discord.Guild, channel: discord.TextChannel):
+    def invalidate_questions(self, guild: discord.Guild):
+        """Forget the compiled questions after a command changed them."""
+        self._question_cache.pop(guild.id, None)
+
+    async def ask_questions(self, member: discord.Member, guild: discord.Guild, channel: discord.TextChannel, resume: dict = None):
+        """Run a question session, or continue a stored one from its unanswered question."""
         prefix = await self.get_prefix(member)
         config = await self.config.guild(guild).all()
-        questions = config['questions']
+        questions = self.compiled_questions(guild, config['questions'])
         role_id = config['role_id']
         role = get(guild.roles, id=role_id)
         kick_on_fail = config['kick_on_fail']
@@ -51,6 +156,7 @@ class Verifier(commands.Cog):
                 await member.send("The admins of this server have enabled verification questions but have not set the role to be granted upon correct answers. Please contact them to have this corrected.")
             except discord.Forbidden:
                 await channel.send(f"{member.mention}, {self.forbidden_help_message}")
+            await self.session_store.discard(guild.id, member.id)
             return
 
         if not questions:
@@ -58,48 +164,115 @@ class Verifier(commands.Cog):
                 await member.send("The admins of this server have enabled verification questions but have not set any questions. Please contact them to have this corrected.")
             except discord.Forbidden:
                 await channel.send(f"{member.mention}, {self.forbidden_help_message}")
+            await self.session_store.discard(guild.id, member.id)
             return
 
-        sticky_questions = [q for q in questions if q.get("sticky")]
-        non_sticky_questions = [q for q in questions if not q.get("sticky")]
+        sticky_questions = [q for q in questions if q[0].get("sticky")]
+        non_sticky_questions = [q for q in questions if not q[0].get("sticky")]
+
+        if resume:
+            by_text = {q["question"]: (q, accepted_answers) for q, accepted_answers in questions}
+            remaining = resume["questions"][resume["index"]:]
+            if not remaining or any(text not in by_text for text in remaining):
+                # The questions changed while the session was stored; start over rather than skip any
+                resume = None
 
-        if num_questions_to_ask:
+        if resume:
+            # Questions already answered are not asked again, so they may have been edited since
+            questions_to_ask = [by_text.get(text) for text in resume["questions"]]
+            start = resume["index"]
+        elif num_questions_to_ask:
             if len(sticky_questions) > num_questions_to_ask:
                 questions_to_ask = sticky_questions
             else:
                 num_additional_questions = num_questions_to_ask - len(sticky_questions)
                 questions_to_ask = sticky_questions + random.sample(non_sticky_questions, num_additional_questions)
+            start = 0
         else:
             questions_to_ask = questions
+            start = 0
 
-        def check(m):
-            return m.author == member and isinstance(m.channel, discord.DMChannel)
-
+        record = {
+            "guild_id": guild.id,
+            "user_id": member.id,
+            "channel_id": channel.id if channel else None,
+            "questions": resume["questions"] if resume else [q["question"] for q, _ in questions_to_ask],
+            "index": start,
+            "deadline": 0,
+        }
+        session = self.dm_router.session(member.id)
+        interrupted = False
+        dm_opened = False
+        position = start
         try:
-            await member.send("Welcome! Please answer the following questions correctly to gain access to the server. You have 90 seconds to answer each question.")
-            for q in questions_to_ask:
+            sent = time.perf_counter()
+            if resume:
+                await member.send("Verification was interrupted. Continuing where you left off.")
+            else:
+                await member.send("Welcome! Please answer the following questions correctly to gain access to the server. You have 90 seconds to answer each question.")
+            self.funnel.record_dm_open(guild.id, time.perf_counter() - sent)
+            dm_opened = True
+            for position in range(start, len(questions_to_ask)):
+                q, accepted_answers = questions_to_ask[position]
+                timeout = ANSWER_TIMEOUT
+                if resume and position == start:
+                    timeout = max(resume["deadline"] - time.time(), RESUME_GRACE)
+                record["index"] = position
+                record["deadline"] = time.time() + timeout
+                await self.session_store.save(record)
                 await member.send(q["question"])
-                msg = await self.bot.wait_for('message', check=check, timeout=90.0)
-                normalized_response = self.normalize_answer(msg.content)
-                if not any(normalized_response == self.normalize_answer(answer) for answer in q["answers"]):
+                asked = time.perf_counter()
+                msg = await session.wait(timeout)
+                answered = time.perf_counter() - asked
+                if normalize_answer(msg.content) not in accepted_answers:
+                    self.funnel.record_answer(guild.id, position, "fail", answered)
                     if kick_on_fail and guild.me.guild_permissions.kick_members:
                         await member.send("Incorrect answer. You have been removed from the server.")
                         await guild.kick(member)
                     else:
                         await member.send("Incorrect answer. Please contact an admin if you believe this is a mistake.")
                     return
+                self.funnel.record_answer(guild.id, position, "pass", answered)
             await member.send("Congratulations! You have answered all questions correctly.")
             await member.add_roles(role)
         except discord.Forbidden:
+            if not dm_opened:
+                self.funnel.record_forbidden(guild.id)
             await channel.send(f"{member.mention}, {self.forbidden_help_message}")
         except asyncio.TimeoutError:
+            self.funnel.record_answer(guild.id, position, "timeout")
             await member.send(f'You took too long to respond. To restart this process run the command {prefix}verify in the server.')
+        except asyncio.CancelledError:
+            interrupted = True  # Cog unloading; keep the stored progress
+            raise
+        finally:
+            session.close()
+            if not interrupted:
+                await self.session_store.discard(guild.id, member.id)
+
+    @commands.Cog.listener()
+    async def on_message(self, message: discord.Message):
+        """Hand direct messages to the verification session waiting on their author."""
+        self.dm_router.route(message)
 
     @commands.Cog.listener()
     async def on_member_join(self, member: discord.Member):
-        verification_enabled = await self.config.guild(member.guild).verification_enabled()
-        if verification_enabled:
-            await self.ask_questions(member, member.guild, member.guild.system_channel)
+        config = await self.config.guild(member.guild).all()
+        if config["verification_enabled"]:
+            admission = self.get_admission(member.guild, config)
+            admission.record_join()
+            channel = member.guild.system_channel
+            # Stored in the background, so a reload while the member waits for a slot still verifies them
+            self.session_store.queue({
+                "guild_id": member.guild.id,
+                "user_id": member.id,
+                "channel_id": channel.id if channel else None,
+                "questions": [],
+                "index": 0,
+                "deadline": time.time() + QUEUED_SESSION_TTL,
+            })
+            admission.submit(member, channel)
+            self.pruner.track(member)
 
     @commands.guild_only()
     @commands.command()
@@ -129,7 +302,11 @@ class Verifier(commands.Cog):
     @verifyset.command()
     async def verifiedrole(self, ctx: commands.Context, role: discord.Role):
         """Set the role to be granted upon correct answers."""
+        if role.id != await self.config.guild(ctx.guild).role_id():
+            # Members verified under the old role don't have this one; only prune joins from now on
+            await self._restart_prune_window(ctx.guild)
         await self.config.guild(ctx.guild).role_id.set(role.id)
+        await self._reconfigure_prune(ctx.guild)
         await ctx.send(f"The verified role has been set to {role.name}.")
 
     @verifyset.command()
@@ -137,6 +314,7 @@ class Verifier(commands.Cog):
         """Add a question to the verification quiz. Provide multiple answers separated by spaces."""
         async with self.config.guild(ctx.guild).questions() as questions:
             questions.append({"question": question, "answers": list(answers), "sticky": False})
+        self.invalidate_questions(ctx.guild)
         await ctx.send("Question added.")
 
     @verifyset.command()
@@ -148,6 +326,7 @@ class Verifier(commands.Cog):
                 await ctx.send(f"Removed question: {removed_question['question']}")
             else:
                 await ctx.send("Invalid question index.")
+        self.invalidate_questions(ctx.guild)
 
     @verifyset.command()
     async def editquestion(self, ctx: commands.Context, index: int, question: str, *answers: str):
@@ -158,6 +337,7 @@ class Verifier(commands.Cog):
                 await ctx.send(f"Question {index} has been updated.")
             else:
                 await ctx.send("Invalid question index.")
+        self.invalidate_questions(ctx.guild)
 
     @verifyset.command()
     async def listquestions(self, ctx: commands.Context):
@@ -170,6 +350,73 @@ class Verifier(commands.Cog):
         question_list = "\n".join([f'{i+1}. Q: "{q["question"]}" A: {", ".join(q["answers"])} (Sticky: {"Yes" if q.get("sticky") else "No"})' for i, q in enumerate(questions)])
         await ctx.send(f"Verification Questions:\n{question_list}\n\nThis post will be deleted in 60 seconds.", delete_after=60)
 
+    @verifyset.command()
+    async def importquestions(self, ctx: commands.Context, append: bool = False):
+        """Replace the verification questions with an attached JSON or YAML file.
+
+        The file is a list of `{"question": ..., "answers": [...], "sticky": false}`
+        objects, as written by `exportquestions`. Nothing is changed unless every
+        question in the file is valid.
+
+        Args:
+            append: Add the file's questions after the current ones instead of replacing them (default: false)
+        """
+        if not ctx.message.attachments:
+            await ctx.send("Attach a `.json` or `.yaml` file to import.")
+            return
+        attachment = ctx.message.attachments[0]
+        if attachment.size > MAX_BANK_SIZE:
+            await ctx.send(f"The file is too large; question banks can be at most {MAX_BANK_SIZE // 1024} KiB.")
+            return
+        try:
+            text = (await attachment.read()).decode("utf-8-sig")
+        except (discord.HTTPException, UnicodeDecodeError) as e:
+            await ctx.send(f"Could not read the file: {e}")
+            return
+
+        imported, errors = parse_question_bank(text, bank_format(attachment.filename))
+        if append and not errors:
+            current = self.compiled_questions(ctx.guild, await self.config.guild(ctx.guild).questions())
+            existing = {q["question"] for q, _ in current}
+            errors = [f'Question {number}: "{q["question"]}" already exists.' for number, (q, _) in enumerate(imported, start=1) if q["question"] in existing]
+            imported = current + imported
+        if errors:
+            shown = "\n".join(errors[:10])
+            more = f"\n...and {len(errors) - 10} more." if len(errors) > 10 else ""
+            await ctx.send(f"No questions were imported. Problems found:\n{shown}{more}")
+            return
+        if not imported:
+            await ctx.send("The file does not contain any questions.")
+            return
+
+        await self.config.guild(ctx.guild).questions.set([q for q, _ in imported])
+        self._question_cache[ctx.guild.id] = imported
+        await ctx.send(f"Imported questions; the server now has {len(imported)} verification question(s).")
+
+    @verifyset.command()
+    async def exportquestions(self, ctx: commands.Context, file_format: str = "json"):
+        """Export the verification questions as a JSON or YAML attachment.
+
+        Args:
+            file_format: `json` or `yaml` (default: json)
+        """
+        file_format = file_format.lower()
+        if file_format not in ("json", "yaml"):
+            await ctx.send("File format must be `json` or `yaml`.")
+            return
+        if file_format == "yaml" and yaml is None:
+            await ctx.send("YAML export needs PyYAML installed on the bot; use JSON instead.")
+            return
+        questions = await self.config.guild(ctx.guild).questions()
+        if not questions:
+            await ctx.send("No verification questions set.")
+            return
+        export = io.BytesIO(dump_question_bank(questions, file_format).encode("utf-8"))
+        await ctx.send(
+            f"Exported {len(questions)} verification question(s).",
+            file=discord.File(export, filename=f"verification_questions.{file_format}"),
+        )
+
     @verifyset.command()
     async def setkickonfail(self, ctx: commands.Context, kick_on_fail: bool):
         """Enable or disable kicking the user on verification failure."""
@@ -180,7 +427,11 @@ class Verifier(commands.Cog):
     @verifyset.command()
     async def enabled(self, ctx: commands.Context, verification_enabled: bool):
         """Enable or disable the verification process."""
+        if verification_enabled and not await self.config.guild(ctx.guild).verification_enabled():
+            # Members who joined while verification was off were never asked; only prune joins from now on
+            await self._restart_prune_window(ctx.guild)
         await self.config.guild(ctx.guild).verification_enabled.set(verification_enabled)
+        await self._reconfigure_prune(ctx.guild)
         status = "enabled" if verification_enabled else "disabled"
         await ctx.send(f"Verification has been {status}.")
 
@@ -204,7 +455,180 @@ class Verifier(commands.Cog):
                 await ctx.send(f"Question {index} has been marked as {status}.")
             else:
                 await ctx.send("Invalid question index.")
+        self.invalidate_questions(ctx.guild)
 
-    async def red_delete_data_for_user(self, **kwargs):
-        """Nothing to delete."""
-        return
+    @verifyset.group(invoke_without_command=True)
+    async def raid(self, ctx: commands.Context):
+        """Show the join-raid status and verification queue for this server."""
+        config = await self.config.guild(ctx.guild).all()
+        admission = self.admissions.get(ctx.guild.id)
+        if admission is None:
+            await ctx.send(
+                f"No joins have been queued since the cog was loaded.\n"
+                f"Limits: {config['max_sessions']} concurrent session(s), "
+                f"raid mode above {config['raid_joins_per_second']} joins/s with {config['raid_max_sessions']} session(s).\n"
+                f"Armed answer deadlines: {len(self.dm_router.deadlines)}"
+            )
+            return
+
+        mean_wait, max_wait = admission.recent_waits()
+        if admission.raiding:
+            raid_status = f"**Active** for {time.monotonic() - admission.raid_started:.0f}s"
+        else:
+            raid_status = "Inactive"
+        await ctx.send(
+            f"**Raid mode:** {raid_status}\n"
+            f"**Join rate:** {admission.join_rate():.1f} joins/s (threshold {admission.raid_joins_per_second})\n"
+            f"**Sessions:** {admission.active} running, limit {admission.capacity} "
+            f"({admission.max_sessions} normal, {admission.raid_max_sessions} during a raid)\n"
+            f"**Queue depth:** {admission.depth}, oldest waiting {admission.oldest_wait():.0f}s\n"
+            f"**Recent waits:** {mean_wait:.1f}s average, {max_wait:.1f}s max\n"
+            f"**Armed answer deadlines:** {len(self.dm_router.deadlines)} across all servers"
+        )
+
+    @raid.command(name="sessions")
+    async def raid_sessions(self, ctx: commands.Context, max_sessions: int):
+        """Set how many verification sessions may run at once."""
+        if max_sessions < 1:
+            await ctx.send("The session limit must be at least 1.")
+            return
+        await self.config.guild(ctx.guild).max_sessions.set(max_sessions)
+        await self._reconfigure_admission(ctx.guild)
+        await ctx.send(f"Up to {max_sessions} verification session(s) will run at once.")
+
+    @raid.command(name="threshold")
+    async def raid_threshold(self, ctx: commands.Context, joins_per_second: float):
+        """Set the join rate (joins per second) that turns on raid mode."""
+        if joins_per_second <= 0:
+            await ctx.send("The raid threshold must be greater than 0.")
+            return
+        await self.config.guild(ctx.guild).raid_joins_per_second.set(joins_per_second)
+        await self._reconfigure_admission(ctx.guild)
+        await ctx.send(f"Raid mode will turn on above {joins_per_second} joins per second.")
+
+    @raid.command(name="raidsessions")
+    async def raid_raidsessions(self, ctx: commands.Context, max_sessions: int):
+        """Set how many verification sessions may run at once during a raid."""
+        if max_sessions < 1:
+            await ctx.send("The session limit must be at least 1.")
+            return
+        await self.config.guild(ctx.guild).raid_max_sessions.set(max_sessions)
+        await self._reconfigure_admission(ctx.guild)
+        await ctx.send(f"Up to {max_sessions} verification session(s) will run at once during a raid.")
+
+    @verifyset.group(invoke_without_command=True)
+    async def stats(self, ctx: commands.Context):
+        """Show where verification time is spent and where members drop out."""
+        funnel = self.funnel.get(ctx.guild.id)
+        if not funnel.dms_opened and not funnel.dms_forbidden:
+            await ctx.send("No verification sessions have been recorded yet.")
+            return
+
+        def latencies(samples):
+            return (
+                f"p50 {percentile(samples, 50):.2f}s, p95 {percentile(samples, 95):.2f}s, "
+                f"p99 {percentile(samples, 99):.2f}s ({len(samples)} samples)"
+            )
+
+        lines = [
+            f"**DM open latency:** {latencies(funnel.dm_open)}",
+            f"**DMs blocked:** {funnel.dms_forbidden} of {funnel.dms_opened + funnel.dms_forbidden} "
+            f"({funnel.forbidden_rate:.1%})",
+        ]
+        for index in sorted(funnel.outcomes):
+            counts = dict(zip(OUTCOMES, funnel.outcomes[index]))
+            lines.append(
+                f"**Session question {index + 1}:** {counts['pass']} passed, {counts['fail']} failed, "
+                f"{counts['timeout']} timed out; answer {latencies(funnel.answers.get(index, ()))}"
+            )
+        await ctx.send("\n".join(lines))
+
+    @stats.command(name="reset")
+    async def stats_reset(self, ctx: commands.Context):
+        """Clear the verification statistics for this server."""
+        await self.funnel.reset(ctx.guild.id)
+        await ctx.send("Verification statistics have been reset.")
+
+    @verifyset.command()
+    async def prune(self, ctx: commands.Context, hours: float = None):
+        """Kick members who have not verified within a number of hours of joining.
+
+        Members are kicked one at a time once their window has passed, if they
+        still lack the verified role. Nobody is kicked sooner than the window
+        after this command. If existing members lack the verified role, you are
+        asked whether to prune them too. Run without a number to see the
+        current policy.
+
+        Args:
+            hours: Hours new members have to verify; 0 turns pruning off
+        """
+        if hours is None:
+            config = await self.config.guild(ctx.guild).all()
+            if not config["prune_hours"]:
+                await ctx.send("Pruning of unverified members is off.")
+                return
+            status = f"Members who have not verified within {config['prune_hours']:g} hour(s) of joining are kicked."
+            if not config["prune_existing"]:
+                status += f" Members who joined before <t:{int(config['prune_since'])}:f> are not pruned."
+            if not config["verification_enabled"] or not config["role_id"]:
+                status += " Pruning is paused until verification is enabled and a verified role is set."
+            await ctx.send(
+                f"{status}\nQueued deadlines: {self.pruner.pending_for(ctx.guild.id)}, "
+                f"members pruned since the cog loaded: {self.pruner.kicked.get(ctx.guild.id, 0)}"
+            )
+            return
+        if hours < 0:
+            await ctx.send("The prune window cannot be negative.")
+            return
+        if not hours:
+            await self.config.guild(ctx.guild).prune_hours.set(None)
+            await self._reconfigure_prune(ctx.guild)
+            await ctx.send("Pruning of unverified members has been turned off.")
+            return
+
+        now = time.time()
+        role_id = await self.config.guild(ctx.guild).role_id()
+        existing = len(unverified_members(ctx.guild, role_id, now)) if role_id else 0
+        include_existing = False
+        if existing:
+            await ctx.send(
+                f"{existing} current member(s) do not have the verified role. Should they be kicked too if they "
+                f"have not verified {hours:g} hour(s) from now? (yes/no)"
+            )
+            pred = MessagePredicate.yes_or_no(ctx)
+            try:
+                await self.bot.wait_for("message", check=pred, timeout=60)
+            except asyncio.TimeoutError:
+                await ctx.send("No answer received; the prune policy was not changed.")
+                return
+            include_existing = pred.result
+
+        await self.config.guild(ctx.guild).prune_since.set(now)
+        await self.config.guild(ctx.guild).prune_existing.set(include_existing)
+        await self.config.guild(ctx.guild).prune_hours.set(hours)
+        await self._reconfigure_prune(ctx.guild)
+        message = f"Members who join from now on and have not verified within {hours:g} hour(s) will be kicked."
+        if include_existing:
+            message += f" The {existing} current unverified member(s) have {hours:g} hour(s) from now."
+        elif existing:
+            message += " Current members will not be pruned."
+        if not ctx.guild.me.guild_permissions.kick_members:
+            message += " I need the Kick Members permission to do this."
+        await ctx.send(message)
+
+    async def _reconfigure_prune(self, guild: discord.Guild):
+        self.pruner.configure(guild, policy_from_config(await self.config.guild(guild).all()))
+
+    async def _restart_prune_window(self, guild: discord.Guild):
+        """Cover only members who join from now on, if a prune policy is set."""
+        if await self.config.guild(guild).prune_hours():
+            await self.config.guild(guild).prune_since.set(time.time())
+            await self.config.guild(guild).prune_existing.set(False)
+
+    async def _reconfigure_admission(self, guild: discord.Guild):
+        if guild.id in self.admissions:
+            self.get_admission(guild, await self.config.guild(guild).all())
+
+    async def red_delete_data_for_user(self, *, requester, user_id: int):
+        """Delete the user's unfinished verification sessions."""
+        await self.session_store.discard_user(user_id)
@@ -0,0 +1,29 @@
+import string
+from typing import FrozenSet, Iterable
+
+_ALNUM = frozenset(string.ascii_letters + string.digits)
+
+# Lowercases ASCII letters and deletes every other ASCII character that is not a letter or digit
+_NORMALIZE_TABLE = str.maketrans(
+    string.ascii_uppercase,
+    string.ascii_lowercase,
+    "".join(chr(code) for code in range(128) if chr(code) not in _ALNUM),
+)
+
+
+def normalize_answer(answer: str) -> str:
+    """Keep only ASCII letters and digits, lowercased.
+
+    Equivalent to ``re.sub(r"[^a-zA-Z0-9]", "", answer).lower()``. The
+    translation table handles ASCII input in one pass; anything non-ASCII that
+    survives it is dropped by the slower fallback.
+    """
+    normalized = answer.translate(_NORMALIZE_TABLE)
+    if not normalized.isascii():
+        normalized = "".join(char for char in normalized if char in _ALNUM)
+    return normalized
+
+
+def compile_answers(answers: Iterable[str]) -> FrozenSet[str]:
+    """Normalize accepted answers once so checking a response is a single set lookup."""
+    return frozenset(normalize_answer(answer) for answer in answers)
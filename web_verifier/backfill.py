@@ -0,0 +1,129 @@
+import asyncio
+import logging
+import time
+from typing import Any, Dict, Optional
+
+import discord
+
+from .role_executor import RoleMutation
+
+log = logging.getLogger("red.reediculous-cogs.web_verifier.backfill")
+
+CHUNK_SIZE = 100  # Members checked between cursor saves
+PROGRESS_INTERVAL = 15  # Seconds between progress message edits
+
+
+def new_backfill_state(channel_id: Optional[int], message_id: Optional[int]) -> Dict[str, Any]:
+    return {
+        "cursor": 0,
+        "checked": 0,
+        "granted": 0,
+        "failed": 0,
+        "total": 0,
+        "channel_id": channel_id,
+        "message_id": message_id,
+        "started_at": int(time.time()),
+    }
+
+
+class RoleBackfill:
+    """Grants the verified role to already verified members of one guild.
+
+    Members are walked in ID order in chunks of ``CHUNK_SIZE``. After each
+    chunk the last processed ID is saved as the cursor in the guild's
+    ``backfill`` setting, so a reload resumes where it stopped. Role grants go
+    through the cog's low-priority backfill lane, so interactive verifications
+    are not queued behind a chunk.
+    """
+
+    def __init__(self, cog, guild: discord.Guild, state: Dict[str, Any]):
+        self.cog = cog
+        self.guild = guild
+        self.state = state
+        self.task: Optional[asyncio.Task] = None
+        self._last_progress = 0.0
+
+    def start(self) -> None:
+        self.task = asyncio.create_task(self.run())
+
+    def cancel(self) -> None:
+        if self.task:
+            self.task.cancel()
+
+    async def stop(self) -> None:
+        """Cancel the task and wait until it has stopped writing progress."""
+        self.cancel()
+        if self.task:
+            await asyncio.gather(self.task, return_exceptions=True)
+
+    @property
+    def running(self) -> bool:
+        return self.task is not None and not self.task.done()
+
+    def describe(self) -> str:
+        state = self.state
+        total = state["total"] or state["checked"]
+        percent = f" ({state['checked'] * 100 // total}%)" if total else ""
+        return (
+            f"Checked {state['checked']}/{total} member(s){percent}, "
+            f"granted the verified role to {state['granted']}, {state['failed']} failed."
+        )
+
+    async def _save(self) -> None:
+        await self.cog.config.guild(self.guild).backfill.set(self.state)
+
+    async def _report(self, text: str, force: bool = False) -> None:
+        now = time.monotonic()
+        if not force and now - self._last_progress < PROGRESS_INTERVAL:
+            return
+        self._last_progress = now
+        channel = self.guild.get_channel(self.state["channel_id"]) if self.state["channel_id"] else None
+        if channel is None or not self.state["message_id"]:
+            return
+        try:
+            await channel.get_partial_message(self.state["message_id"]).edit(content=text)
+        except discord.HTTPException:
+            pass  # Message deleted or no permission; progress is still available from the status command
+
+    async def run(self) -> None:
+        guild = self.guild
+        member_ids = sorted(member.id for member in guild.members if member.id > self.state["cursor"])
+        self.state["total"] = self.state["checked"] + len(member_ids)
+
+        try:
+            for start in range(0, len(member_ids), CHUNK_SIZE):
+                settings = self.cog.guild_settings(guild)
+                role = guild.get_role(settings.role_id) if settings.role_id else None
+                if not settings.enabled or role is None:
+                    await self._report("Verified role backfill stopped: verification was disabled or the role was removed.", force=True)
+                    break
+
+                chunk = member_ids[start:start + CHUNK_SIZE]
+                mutations = []
+                for member_id in chunk:
+                    member = guild.get_member(member_id)
+                    if member and member_id in self.cog.verified_index and role not in member.roles:
+                        mutations.append(RoleMutation(guild, member, role, True, "Verified role backfill"))
+
+                result = await self.cog.apply_role_mutations(mutations, self.cog.backfill_executor)
+                for done in result.succeeded:
+                    # Dispatch verification event for already verified members
+                    member = done.mutation.member
+                    self.cog.bot.dispatch('member_verified', guild, member, self.cog.verified_index.get(member.id))
+
+                self.state["cursor"] = chunk[-1]
+                self.state["checked"] += len(chunk)
+                self.state["granted"] += len(result.succeeded)
+                self.state["failed"] += len(result.failed)
+                await self._save()
+                await self._report(f"Granting verified role to already verified members... {self.describe()}")
+            else:
+                await self._report(f"Verified role backfill complete. {self.describe()}", force=True)
+        except asyncio.CancelledError:
+            # Cog unload keeps the saved cursor; an explicit cancel clears it through finish_backfill
+            raise
+        except Exception as e:
+            log.error(f"Verified role backfill failed in {guild.name}: {e}", exc_info=True)
+            await self._report(f"Verified role backfill failed: {e}. {self.describe()}", force=True)
+            return
+        await self.cog.finish_backfill(guild)
@@ -0,0 +1,85 @@
+import asyncio
+from collections import deque
+from typing import Deque, Dict, List, Optional
+
+import discord
+
+from .deadlines import DeadlineScheduler
+
+
+class DMSession:
+    """Direct messages from one user, delivered while a verification session waits for answers."""
+
+    __slots__ = ("router", "user_id", "_messages", "_waiter")
+
+    def __init__(self, router: "DMRouter", user_id: int):
+        self.router = router
+        self.user_id = user_id
+        self._messages: Deque[discord.Message] = deque()
+        self._waiter: Optional[asyncio.Future] = None
+
+    def deliver(self, message: discord.Message) -> None:
+        if self._waiter is not None and not self._waiter.done():
+            self._waiter.set_result(message)
+        else:
+            self._messages.append(message)
+
+    async def wait(self, timeout: float) -> discord.Message:
+        """Return the user's next direct message, raising asyncio.TimeoutError like ``bot.wait_for``."""
+        if self._messages:
+            return self._messages.popleft()
+        self._waiter = asyncio.get_running_loop().create_future()
+        try:
+            return await self.router.deadlines.wait(self._waiter, timeout)
+        finally:
+            self._waiter = None
+
+    def close(self) -> None:
+        self.router._remove(self)
+
+    def __enter__(self) -> "DMSession":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+class DMRouter:
+    """Routes direct messages to the sessions waiting on their author.
+
+    ``bot.wait_for`` evaluates every pending check on every message, so each
+    DM costs one call per open session. Sessions registered here are found
+    with a single dict lookup by author ID from the cog's ``on_message``,
+    and their answer timeouts share one :class:`DeadlineScheduler`.
+    """
+
+    __slots__ = ("_sessions", "deadlines")
+
+    def __init__(self):
+        self._sessions: Dict[int, List[DMSession]] = {}
+        self.deadlines = DeadlineScheduler()
+
+    def session(self, user_id: int) -> DMSession:
+        """Open a session for a user; use it as a context manager so it is always closed."""
+        session = DMSession(self, user_id)
+        self._sessions.setdefault(user_id, []).append(session)
+        return session
+
+    def _remove(self, session: DMSession) -> None:
+        sessions = self._sessions.get(session.user_id)
+        if sessions and session in sessions:
+            sessions.remove(session)
+            if not sessions:
+                del self._sessions[session.user_id]
+
+    def route(self, message: discord.Message) -> bool:
+        """Deliver a direct message to its author's open sessions; return whether any were waiting."""
+        sessions = self._sessions.get(message.author.id)
+        if not sessions or not isinstance(message.channel, discord.DMChannel):
+            return False
+        for session in sessions:
+            session.deliver(message)
+        return True
+
+    def __len__(self) -> int:
+        return sum(len(sessions) for sessions in self._sessions.values())
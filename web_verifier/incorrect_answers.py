@@ -0,0 +1,344 @@
+import asyncio
+import copy
+import hashlib
+import logging
+import math
+import time
+from bisect import bisect_left, insort
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from .storage import INCORRECT_ANSWER_GROUP
+
+log = logging.getLogger("red.reediculous-cogs.web_verifier.incorrect_answers")
+
+MAX_ORIGINAL_FORMS = 25  # Original spellings kept per normalized answer
+MAX_TRACKED_USERS = 100  # Exact user keys kept per answer before switching to an estimate
+SKETCH_BITS = 2048  # Size of the linear-counting bitmap used past MAX_TRACKED_USERS
+
+
+def _sketch_bit(user_key: str) -> int:
+    digest = hashlib.blake2b(user_key.encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "big") % SKETCH_BITS
+
+
+def sketch_add(sketch: int, user_key: str) -> int:
+    return sketch | (1 << _sketch_bit(user_key))
+
+
+def sketch_estimate(sketch: int) -> int:
+    """Linear-counting estimate of how many distinct keys were added to a sketch."""
+    zeros = SKETCH_BITS - bin(sketch).count("1")
+    if zeros == 0:
+        return round(SKETCH_BITS * math.log(SKETCH_BITS))
+    return round(-SKETCH_BITS * math.log(zeros / SKETCH_BITS))
+
+
+def unique_user_count(entry: Dict[str, Any]) -> int:
+    """Number of distinct users behind a logged answer, exact or estimated."""
+    return entry.get("unique_users", len(entry.get("users", [])))
+
+
+def guild_counts(entry: Dict[str, Any]) -> Dict[str, int]:
+    """Attempts per guild ID for an entry.
+
+    Entries written before per-guild counts existed fall back to counting the
+    ``user:guild`` keys in ``users``.
+    """
+    if "guilds" in entry:
+        return entry["guilds"]
+    counts: Dict[str, int] = {}
+    for user_key in entry.get("users", []):
+        guild_id = str(user_key).rpartition(":")[2]
+        counts[guild_id] = counts.get(guild_id, 0) + 1
+    return counts
+
+
+class IncorrectAnswerIndex:
+    """Sorted in-memory views over the incorrect answer log.
+
+    Entries are kept in lists ordered by (count, last seen), by last seen, and
+    by per-guild count. The aggregator updates them on every flush, so a page
+    is a slice of an already sorted list rather than a sort of the whole log.
+    """
+
+    def __init__(self):
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._by_count: List[Tuple[int, int, str]] = []
+        self._by_recent: List[Tuple[int, str]] = []
+        self._by_guild: Dict[str, List[Tuple[int, int, str]]] = {}
+        self.total_attempts = 0
+
+    def load(self, incorrect_answers: Dict[str, Dict[str, Any]]) -> None:
+        self.clear()
+        for normalized_answer, entry in incorrect_answers.items():
+            self._entries[normalized_answer] = entry
+            self.total_attempts += entry.get("count", 0)
+        self._by_count = sorted(self._count_key(answer, entry) for answer, entry in self._entries.items())
+        self._by_recent = sorted(self._recent_key(answer, entry) for answer, entry in self._entries.items())
+        for answer, entry in self._entries.items():
+            for guild_id, count in guild_counts(entry).items():
+                self._by_guild.setdefault(guild_id, []).append((-count, -entry.get("last_seen", 0), answer))
+        for keys in self._by_guild.values():
+            keys.sort()
+
+    def clear(self) -> None:
+        self._entries = {}
+        self._by_count = []
+        self._by_recent = []
+        self._by_guild = {}
+        self.total_attempts = 0
+
+    @staticmethod
+    def _count_key(answer: str, entry: Dict[str, Any]) -> Tuple[int, int, str]:
+        return (-entry.get("count", 0), -entry.get("last_seen", 0), answer)
+
+    @staticmethod
+    def _recent_key(answer: str, entry: Dict[str, Any]) -> Tuple[int, str]:
+        return (-entry.get("last_seen", 0), answer)
+
+    @staticmethod
+    def _remove(keys: list, key: tuple) -> None:
+        position = bisect_left(keys, key)
+        if position < len(keys) and keys[position] == key:
+            del keys[position]
+
+    def update(self, normalized_answer: str, entry: Dict[str, Any]) -> None:
+        """Replace one entry, moving it within each sorted view."""
+        old = self._entries.get(normalized_answer)
+        if old is not None:
+            self.total_attempts -= old.get("count", 0)
+            self._remove(self._by_count, self._count_key(normalized_answer, old))
+            self._remove(self._by_recent, self._recent_key(normalized_answer, old))
+            for guild_id, count in guild_counts(old).items():
+                self._remove(self._by_guild.get(guild_id, []), (-count, -old.get("last_seen", 0), normalized_answer))
+
+        entry = dict(entry, guilds=dict(guild_counts(entry)))
+        self._entries[normalized_answer] = entry
+        self.total_attempts += entry.get("count", 0)
+        insort(self._by_count, self._count_key(normalized_answer, entry))
+        insort(self._by_recent, self._recent_key(normalized_answer, entry))
+        for guild_id, count in entry["guilds"].items():
+            insort(self._by_guild.setdefault(guild_id, []), (-count, -entry.get("last_seen", 0), normalized_answer))
+
+    def get(self, normalized_answer: str) -> Optional[Dict[str, Any]]:
+        return self._entries.get(normalized_answer)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def page(
+        self,
+        offset: int,
+        limit: int,
+        *,
+        guild_id: Optional[int] = None,
+        since: Optional[int] = None,
+        min_count: int = 0,
+    ) -> Tuple[List[Tuple[str, Dict[str, Any]]], bool]:
+        """Return one page of entries and whether another page follows.
+
+        Without a time window, entries are ordered by count (per-guild count
+        when ``guild_id`` is given) and the scan stops at the first entry
+        below ``min_count``. With ``since``, entries are ordered by how
+        recently they were seen and the scan stops at the window's edge.
+        """
+        guild_key = str(guild_id) if guild_id is not None else None
+        if since is not None:
+            candidates: Iterator[Tuple[int, ...]] = iter(self._by_recent)
+        elif guild_key is not None:
+            candidates = iter(self._by_guild.get(guild_key, []))
+        else:
+            candidates = iter(self._by_count)
+
+        results = []
+        skipped = 0
+        for key in candidates:
+            answer = key[-1]
+            entry = self._entries[answer]
+            if since is not None and entry.get("last_seen", 0) < since:
+                break
+            count = guild_counts(entry).get(guild_key, 0) if guild_key is not None else entry.get("count", 0)
+            if count < min_count:
+                if since is None:
+                    break  # Sorted by this count, nothing further qualifies
+                continue
+            if guild_key is not None and since is not None and guild_key not in guild_counts(entry):
+                continue
+            if skipped < offset:
+                skipped += 1
+                continue
+            if len(results) == limit:
+                return results, True
+            results.append((answer, entry))
+        return results, False
+
+
+class _Delta:
+    __slots__ = ("count", "original_forms", "users", "guilds", "first_seen", "last_seen")
+
+    def __init__(self, now: int):
+        self.count = 0
+        self.original_forms = set()
+        self.users = set()
+        self.guilds: Dict[str, int] = {}
+        self.first_seen = now
+        self.last_seen = now
+
+
+class IncorrectAnswerLog:
+    """Write-buffered aggregator for the incorrect answer log.
+
+    ``record`` only touches an in-memory delta. Each entry is stored under its
+    normalized answer in the ``INCORRECT_ANSWER`` custom group, and the deltas
+    are merged into the changed keys every ``flush_interval`` seconds, once
+    ``flush_threshold`` answers are pending, or when the cog unloads. Each entry
+    keeps at most ``MAX_ORIGINAL_FORMS`` spellings and ``MAX_TRACKED_USERS``
+    user keys; past that, distinct users are counted with a small bitmap sketch.
+    """
+
+    def __init__(self, config, *, flush_interval: float = 30, flush_threshold: int = 100):
+        self.config = config
+        self.index = IncorrectAnswerIndex()
+        self.flush_interval = flush_interval
+        self.flush_threshold = flush_threshold
+        self._pending: Dict[str, _Delta] = {}
+        self._pending_events = 0
+        self._flush_lock = asyncio.Lock()
+        self._flush_task: Optional[asyncio.Task] = None
+        self._loop_task: Optional[asyncio.Task] = None
+
+    async def start(self) -> None:
+        """Load the sorted index and start the periodic flush."""
+        self.index.load(await self.config.custom(INCORRECT_ANSWER_GROUP).all())
+        self._loop_task = asyncio.create_task(self._flush_loop())
+
+    async def stop(self) -> None:
+        """Stop the periodic flush and write out anything still pending."""
+        if self._loop_task:
+            self._loop_task.cancel()
+        await self.flush()
+
+    def record(self, user_id: int, guild_id: int, original_answer: str, normalized_answer: str) -> None:
+        now = int(time.time())
+        delta = self._pending.get(normalized_answer)
+        if delta is None:
+            delta = self._pending[normalized_answer] = _Delta(now)
+        delta.count += 1
+        delta.last_seen = now
+        if len(delta.original_forms) < MAX_ORIGINAL_FORMS:
+            delta.original_forms.add(original_answer)
+        delta.users.add(f"{user_id}:{guild_id}")
+        delta.guilds[str(guild_id)] = delta.guilds.get(str(guild_id), 0) + 1
+        self._pending_events += 1
+        if self._pending_events >= self.flush_threshold and (self._flush_task is None or self._flush_task.done()):
+            self._flush_task = asyncio.create_task(self.flush())
+
+    async def clear(self) -> None:
+        """Drop pending deltas and the stored log."""
+        async with self._flush_lock:
+            self._pending = {}
+            self._pending_events = 0
+            await self.config.custom(INCORRECT_ANSWER_GROUP).clear()
+            self.index.clear()
+
+    @property
+    def pending(self) -> int:
+        return self._pending_events
+
+    async def flush(self) -> None:
+        """Merge every pending delta into its stored entry, writing only the changed keys."""
+        async with self._flush_lock:
+            if not self._pending:
+                return
+            pending, self._pending = self._pending, {}
+            self._pending_events = 0
+            for normalized_answer, delta in pending.items():
+                # The index mirrors what is stored, so merging needs no Config read
+                current = self.index.get(normalized_answer)
+                entries = {normalized_answer: copy.deepcopy(current)} if current is not None else {}
+                self._merge(entries, normalized_answer, delta)
+                try:
+                    await self.config.custom(INCORRECT_ANSWER_GROUP, normalized_answer).set(entries[normalized_answer])
+                except Exception as e:
+                    log.error(f"Error flushing incorrect answer {normalized_answer!r}: {e}", exc_info=True)
+                    # Keep the delta for the next attempt
+                    self._requeue(normalized_answer, delta)
+                    continue
+                self.index.update(normalized_answer, entries[normalized_answer])
+
+    def _requeue(self, normalized_answer: str, delta: _Delta) -> None:
+        current = self._pending.get(normalized_answer)
+        if current is None:
+            self._pending[normalized_answer] = delta
+        else:
+            current.count += delta.count
+            current.first_seen = min(current.first_seen, delta.first_seen)
+            current.last_seen = max(current.last_seen, delta.last_seen)
+            current.original_forms |= delta.original_forms
+            current.users |= delta.users
+            for guild_id, count in delta.guilds.items():
+                current.guilds[guild_id] = current.guilds.get(guild_id, 0) + count
+        self._pending_events += delta.count
+
+    @staticmethod
+    def _merge(incorrect_answers: Dict[str, Any], normalized_answer: str, delta: _Delta) -> None:
+        entry = incorrect_answers.get(normalized_answer)
+        if entry is None:
+            entry = incorrect_answers[normalized_answer] = {
+                "count": 0,
+                "original_forms": [],
+                "first_seen": delta.first_seen,
+                "last_seen": delta.last_seen,
+                "users": [],
+            }
+
+        entry["count"] = entry.get("count", 0) + delta.count
+        entry["last_seen"] = max(entry.get("last_seen", 0), delta.last_seen)
+        guilds = dict(guild_counts(entry))
+        for guild_id, count in delta.guilds.items():
+            guilds[guild_id] = guilds.get(guild_id, 0) + count
+        entry["guilds"] = guilds
+
+        # Older versions may have stored sets
+        forms = list(entry.get("original_forms", []))
+        known_forms = set(forms)
+        for form in delta.original_forms:
+            if len(forms) >= MAX_ORIGINAL_FORMS:
+                break
+            if form not in known_forms:
+                forms.append(form)
+                known_forms.add(form)
+        entry["original_forms"] = forms
+
+        users = list(entry.get("users", []))
+        sketch = int(entry["user_sketch"], 16) if entry.get("user_sketch") else None
+        known_users = set(users)
+        if sketch is None and len(users) > MAX_TRACKED_USERS:
+            # Entry written before the cap existed
+            sketch = 0
+            for known_user in users:
+                sketch = sketch_add(sketch, known_user)
+        for user_key in delta.users:
+            if user_key in known_users:
+                continue
+            if sketch is None and len(users) < MAX_TRACKED_USERS:
+                users.append(user_key)
+                known_users.add(user_key)
+                continue
+            if sketch is None:
+                # Switch to estimating; seed the sketch with every exact key
+                sketch = 0
+                for known_user in users:
+                    sketch = sketch_add(sketch, known_user)
+            sketch = sketch_add(sketch, user_key)
+        entry["users"] = users[:MAX_TRACKED_USERS]
+        if sketch is None:
+            entry["unique_users"] = len(entry["users"])
+        else:
+            entry["user_sketch"] = format(sketch, "x")
+            entry["unique_users"] = max(len(entry["users"]), sketch_estimate(sketch))
+
+    async def _flush_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            await self.flush()
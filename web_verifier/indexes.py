@@ -0,0 +1,141 @@
+from typing import AbstractSet, Any, Dict, FrozenSet, Iterable, Iterator, Mapping, NamedTuple, Optional, Set, Tuple
+
+from .answers import compile_answers
+
+
+class VerifiedMemberIndex:
+    """In-memory mirror of the global ``verified_members`` mapping.
+
+    Config stores the mapping as ``str(user_id) -> member_id``, and reading it
+    deep-copies the whole dict. This index is loaded once and kept in sync by
+    every code path that writes to Config, so lookups are a single dict probe
+    keyed by the integer Discord ID and never await anything.
+    """
+
+    __slots__ = ("_members",)
+
+    def __init__(self):
+        self._members: Dict[int, Any] = {}
+
+    def load(self, verified_members: Mapping[str, Any]) -> None:
+        """Replace the index contents with a mapping read from Config."""
+        self._members = {int(user_id): member_id for user_id, member_id in verified_members.items()}
+
+    def get(self, user_id: int, default: Optional[Any] = None) -> Optional[Any]:
+        return self._members.get(user_id, default)
+
+    def set(self, user_id: int, member_id: Any) -> None:
+        self._members[user_id] = member_id
+
+    def discard(self, user_id: int) -> None:
+        self._members.pop(user_id, None)
+
+    def items(self) -> Iterator[Tuple[int, Any]]:
+        return iter(self._members.items())
+
+    def __contains__(self, user_id: int) -> bool:
+        return user_id in self._members
+
+    def __len__(self) -> int:
+        return len(self._members)
+
+
+class GuildMembershipIndex:
+    """Reverse index of ``user_id -> {guild_id}`` for verification-enabled guilds.
+
+    Only guilds where verification is enabled are tracked, so users who share
+    no such guild with the bot take no space. ``ready`` stays False until the
+    index has been built from the member cache once.
+    """
+
+    __slots__ = ("_guilds", "ready")
+
+    _EMPTY: AbstractSet[int] = frozenset()
+
+    def __init__(self):
+        self._guilds: Dict[int, Set[int]] = {}
+        self.ready = False
+
+    def add(self, user_id: int, guild_id: int) -> None:
+        guild_ids = self._guilds.get(user_id)
+        if guild_ids is None:
+            self._guilds[user_id] = {guild_id}
+        else:
+            guild_ids.add(guild_id)
+
+    def discard(self, user_id: int, guild_id: int) -> None:
+        guild_ids = self._guilds.get(user_id)
+        if guild_ids is None:
+            return
+        guild_ids.discard(guild_id)
+        if not guild_ids:
+            del self._guilds[user_id]
+
+    def add_guild(self, guild_id: int, user_ids: Iterable[int]) -> None:
+        for user_id in user_ids:
+            self.add(user_id, guild_id)
+
+    def remove_guild(self, guild_id: int) -> None:
+        """Drop a guild from every entry. This walks the whole index, so it is
+        reserved for rare events such as leaving a guild or disabling verification."""
+        for user_id in [user_id for user_id, guild_ids in self._guilds.items() if guild_id in guild_ids]:
+            self.discard(user_id, guild_id)
+
+    def guilds_for(self, user_id: int) -> AbstractSet[int]:
+        return self._guilds.get(user_id, self._EMPTY)
+
+    def clear(self) -> None:
+        self._guilds.clear()
+        self.ready = False
+
+    def __len__(self) -> int:
+        return len(self._guilds)
+
+
+class GuildSettings(NamedTuple):
+    """Immutable snapshot of one guild's verification settings.
+
+    ``question`` is already resolved against the global fallback, and
+    ``question_source`` is ``"guild"``, ``"global"`` or ``None``. ``answers``
+    holds the question's accepted answers, already normalized. Snapshots are
+    shared between callers and must be treated as read-only.
+    """
+
+    enabled: bool = False
+    role_id: Optional[int] = None
+    verify_on_join: bool = True
+    kick_on_fail: bool = False
+    question: Optional[dict] = None
+    question_source: Optional[str] = None
+    answers: FrozenSet[str] = frozenset()
+
+    @classmethod
+    def from_config(
+        cls, guild_data: Mapping[str, Any], global_question: Optional[dict], global_answers: FrozenSet[str] = frozenset()
+    ) -> "GuildSettings":
+        """Build a snapshot from a guild's Config data and the global question and its compiled answers."""
+        guild_question = guild_data.get("question")
+        if guild_question and guild_question.get("question"):
+            question, source = guild_question, "guild"
+            answers = compile_answers(guild_question.get("answers", []))
+        elif global_question and global_question.get("question"):
+            question, source, answers = global_question, "global", global_answers
+        else:
+            question, source, answers = None, None, frozenset()
+        return cls(
+            enabled=bool(guild_data.get("verification_enabled", False)),
+            role_id=guild_data.get("role_id"),
+            verify_on_join=bool(guild_data.get("verify_on_join", True)),
+            kick_on_fail=bool(guild_data.get("kick_on_fail", False)),
+            question=question,
+            question_source=source,
+            answers=answers,
+        )
+
+    def with_global_question(self, global_question: Optional[dict], global_answers: FrozenSet[str]) -> "GuildSettings":
+        """Return a copy re-resolved against a new global question and its compiled answers."""
+        if self.question_source == "guild":
+            return self
+        if global_question and global_question.get("question"):
+            return self._replace(question=global_question, question_source="global", answers=global_answers)
+        return self._replace(question=None, question_source=None, answers=frozenset())
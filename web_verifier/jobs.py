@@ -0,0 +1,153 @@
+import asyncio
+import logging
+import time
+import uuid
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+log = logging.getLogger("red.reediculous-cogs.web_verifier.jobs")
+
+JOB_GROUP = "VERIFICATION_JOB"
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+
+JOB_DEFAULTS = {
+    "payload": {},
+    "status": QUEUED,
+    "created_at": 0,
+    "started_at": None,
+    "finished_at": None,
+    "result": None,
+}
+
+
+class VerificationJobQueue:
+    """Durable queue of verification jobs processed by a pool of workers.
+
+    Every job is stored under the ``VERIFICATION_JOB`` custom Config group,
+    keyed by job ID, so each state change is a single-key write. Jobs that were
+    queued or running when the cog unloaded are requeued by ``load``, and
+    processed once ``start_workers`` runs after the guild cache is ready.
+    Finished jobs are kept for ``retention`` seconds so their status can be
+    polled.
+    """
+
+    def __init__(
+        self,
+        config,
+        handler: Callable[[Dict[str, Any]], Awaitable[Tuple[int, str]]],
+        *,
+        workers: int = 4,
+        retention: int = 3600,
+    ):
+        self.config = config
+        self.handler = handler
+        self.worker_count = workers
+        self.retention = retention
+        self._jobs: Dict[str, Dict[str, Any]] = {}
+        self._queue: "asyncio.Queue[str]" = asyncio.Queue()
+        self._workers: List[asyncio.Task] = []
+        self._last_prune = 0.0
+
+    async def load(self) -> None:
+        """Load persisted jobs and requeue unfinished ones; new jobs can be submitted from here on."""
+        stored = await self.config.custom(JOB_GROUP).all()
+        requeued = 0
+        for job_id, record in stored.items():
+            record = {**JOB_DEFAULTS, **record}
+            if record["status"] in (QUEUED, RUNNING):
+                record["status"] = QUEUED
+                self._queue.put_nowait(job_id)
+                requeued += 1
+            self._jobs[job_id] = record
+        await self.prune()
+        if requeued:
+            log.info(f"Requeued {requeued} unfinished verification job(s)")
+
+    def start_workers(self) -> None:
+        """Start processing queued jobs. Call once the bot's guild cache is populated."""
+        if not self._workers:
+            self._workers = [asyncio.create_task(self._worker()) for _ in range(self.worker_count)]
+
+    async def stop(self) -> None:
+        """Stop the workers. Unfinished jobs stay persisted and resume on the next start."""
+        for task in self._workers:
+            task.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+
+    async def submit(self, payload: Dict[str, Any]) -> str:
+        """Persist a new job and queue it for processing."""
+        job_id = uuid.uuid4().hex
+        record = {**JOB_DEFAULTS, "payload": payload, "created_at": int(time.time())}
+        self._jobs[job_id] = record
+        await self.config.custom(JOB_GROUP, job_id).set(record)
+        self._queue.put_nowait(job_id)
+        return job_id
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        return self._jobs.get(job_id)
+
+    @property
+    def pending(self) -> int:
+        return self._queue.qsize()
+
+    async def prune(self) -> None:
+        """Forget finished jobs older than the retention window."""
+        now = time.time()
+        self._last_prune = now
+        expired = [
+            job_id
+            for job_id, record in self._jobs.items()
+            if record["finished_at"] and now - record["finished_at"] > self.retention
+        ]
+        for job_id in expired:
+            del self._jobs[job_id]
+            await self.config.custom(JOB_GROUP, job_id).clear()
+
+    async def discard_user(self, user_id: int) -> None:
+        """Forget every job whose payload belongs to the user, queued or finished."""
+        for job_id, record in list(self._jobs.items()):
+            if str(record["payload"].get("user_id")) == str(user_id):
+                del self._jobs[job_id]
+                await self.config.custom(JOB_GROUP, job_id).clear()
+
+    async def _update(self, job_id: str, **changes) -> None:
+        record = self._jobs.get(job_id)
+        if record is None:
+            return  # Discarded while running
+        record.update(changes)
+        await self.config.custom(JOB_GROUP, job_id).set(record)
+
+    async def _worker(self) -> None:
+        while True:
+            job_id = await self._queue.get()
+            try:
+                await self._run(job_id)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                log.error(f"Verification job {job_id} crashed: {e}", exc_info=True)
+            finally:
+                self._queue.task_done()
+
+    async def _run(self, job_id: str) -> None:
+        record = self._jobs.get(job_id)
+        if record is None or record["status"] != QUEUED:
+            return
+        await self._update(job_id, status=RUNNING, started_at=int(time.time()))
+        try:
+            status, text = await self.handler(record["payload"])
+        except Exception as e:
+            log.error(f"Error processing verification job {job_id}: {e}", exc_info=True)
+            status, text = 500, f"Server error: {e}"
+        await self._update(
+            job_id,
+            status=DONE if status < 400 else FAILED,
+            finished_at=int(time.time()),
+            result={"status": status, "text": text},
+        )
+        if time.time() - self._last_prune > 60:
+            await self.prune()
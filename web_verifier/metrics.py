@@ -0,0 +1,147 @@
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Sequence, Tuple
+
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+LabelValues = Tuple[str, ...]
+
+
+def _format_labels(names: Sequence[str], values: LabelValues, extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+class Counter:
+    """Monotonic counter, optionally split by labels."""
+
+    kind = "counter"
+
+    def __init__(self, name: str, help_text: str, labels: Sequence[str] = ()):
+        self.name = name
+        self.help_text = help_text
+        self.labels = tuple(labels)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, *label_values, amount: float = 1) -> None:
+        key = tuple(str(value) for value in label_values)
+        self._values[key] = self._values.get(key, 0) + amount
+
+    def samples(self) -> Iterator[str]:
+        for key, value in self._values.items():
+            yield f"{self.name}{_format_labels(self.labels, key)} {value}"
+
+
+class Gauge(Counter):
+    """Value that can go up and down."""
+
+    kind = "gauge"
+
+    def dec(self, *label_values, amount: float = 1) -> None:
+        self.inc(*label_values, amount=-amount)
+
+    def set(self, value: float, *label_values) -> None:
+        self._values[tuple(str(label) for label in label_values)] = value
+
+
+class Histogram:
+    """Cumulative-bucket histogram in the Prometheus text format."""
+
+    kind = "histogram"
+
+    def __init__(self, name: str, help_text: str, labels: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.name = name
+        self.help_text = help_text
+        self.labels = tuple(labels)
+        self.buckets = tuple(sorted(buckets))
+        # label values -> [per-bucket counts (+Inf last), sum, count]
+        self._values: Dict[LabelValues, list] = {}
+
+    def observe(self, value: float, *label_values) -> None:
+        key = tuple(str(label) for label in label_values)
+        entry = self._values.get(key)
+        if entry is None:
+            entry = self._values[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+        entry[0][bisect_left(self.buckets, value)] += 1
+        entry[1] += value
+        entry[2] += 1
+
+    @contextmanager
+    def time(self, *label_values):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, *label_values)
+
+    def samples(self) -> Iterator[str]:
+        for key, (bucket_counts, total, count) in self._values.items():
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float("inf"),), bucket_counts):
+                cumulative += bucket_count
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                labels = _format_labels(self.labels, key, 'le="' + le + '"')
+                yield f"{self.name}_bucket{labels} {cumulative}"
+            yield f"{self.name}_sum{_format_labels(self.labels, key)} {total}"
+            yield f"{self.name}_count{_format_labels(self.labels, key)} {count}"
+
+
+class VerificationMetrics:
+    """Metrics collected by the WebVerifier web server.
+
+    Recording a sample is a dict lookup and a few additions, so it can sit on
+    the request path without measurable cost.
+    """
+
+    def __init__(self):
+        self.requests = Counter(
+            "webverifier_http_requests_total", "HTTP requests handled, by route and status code.", ("route", "status")
+        )
+        self.in_flight = Gauge("webverifier_http_requests_in_flight", "HTTP requests currently being handled.")
+        self.request_seconds = Histogram(
+            "webverifier_http_request_duration_seconds", "Time spent handling HTTP requests.", ("route",)
+        )
+        self.jwt_decode_seconds = Histogram("webverifier_jwt_decode_seconds", "Time spent decoding JWTs.")
+        self.config_seconds = Histogram(
+            "webverifier_config_operation_seconds", "Time spent in Config reads and writes.", ("operation",)
+        )
+        self.role_grant_seconds = Histogram(
+            "webverifier_role_mutation_seconds", "Latency of verified role grants and removals, by guild.",
+            ("guild_id", "action", "outcome"),
+        )
+        self.dm_failures = Counter("webverifier_dm_failures_total", "Direct messages that could not be delivered.")
+        self.requests_shed = Counter(
+            "webverifier_http_requests_shed_total", "Requests rejected by the overload limits, by reason.", ("reason",)
+        )
+        self.armed_deadlines = Gauge(
+            "webverifier_armed_answer_deadlines", "Verification question answer timeouts currently armed."
+        )
+
+    def all(self) -> List:
+        return [
+            self.requests,
+            self.in_flight,
+            self.request_seconds,
+            self.jwt_decode_seconds,
+            self.config_seconds,
+            self.role_grant_seconds,
+            self.dm_failures,
+            self.requests_shed,
+            self.armed_deadlines,
+        ]
+
+    def render(self) -> str:
+        """Render every metric in the Prometheus text exposition format."""
+        lines = []
+        for metric in self.all():
+            lines.append(f"# HELP {metric.name} {metric.help_text}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric.samples())
+        return "\n".join(lines) + "\n"
@@ -0,0 +1,196 @@
+import asyncio
+import logging
+import random
+import time
+from typing import Any, Awaitable, Callable, Dict, Hashable, Iterable, List, NamedTuple, Optional
+
+log = logging.getLogger("red.reediculous-cogs.web_verifier.role_executor")
+
+
+class RoleMutation(NamedTuple):
+    """A single role grant or removal for one member in one guild."""
+
+    guild: Any
+    member: Any
+    role: Any
+    add: bool = True
+    reason: Optional[str] = None
+
+
+class RoleMutationResult(NamedTuple):
+    mutation: RoleMutation
+    ok: bool
+    attempts: int
+    error: Optional[BaseException] = None
+
+
+class FanOutResult:
+    """Aggregated outcome of one batch of role mutations."""
+
+    __slots__ = ("results", "elapsed")
+
+    def __init__(self, results: List[RoleMutationResult], elapsed: float):
+        self.results = results
+        self.elapsed = elapsed
+
+    @property
+    def succeeded(self) -> List[RoleMutationResult]:
+        return [result for result in self.results if result.ok]
+
+    @property
+    def failed(self) -> List[RoleMutationResult]:
+        return [result for result in self.results if not result.ok]
+
+    def __len__(self) -> int:
+        return len(self.results)
+
+
+async def discord_perform(mutation: RoleMutation) -> None:
+    """Default transport: apply the mutation through discord.py."""
+    if mutation.add:
+        await mutation.member.add_roles(mutation.role, reason=mutation.reason)
+    else:
+        await mutation.member.remove_roles(mutation.role, reason=mutation.reason)
+
+
+def default_route_key(mutation: RoleMutation) -> Hashable:
+    """Discord buckets member role routes by guild, so budget per guild and verb."""
+    return ("PUT" if mutation.add else "DELETE", mutation.guild.id)
+
+
+class _RouteBudget:
+    """Token bucket for one rate-limit route, shared by every lane of an executor."""
+
+    __slots__ = ("tokens", "updated")
+
+    def __init__(self, capacity: float):
+        self.tokens = capacity
+        self.updated = time.monotonic()
+
+
+class RoleExecutor:
+    """Applies role mutations concurrently within per-route rate-limit budgets.
+
+    ``perform`` does the actual HTTP work and defaults to discord.py; tests and
+    benchmarks can pass a fake coroutine instead. Exceptions that carry
+    ``status == 429`` are retried with backoff, honouring ``retry_after`` when
+    the exception provides one. Any other exception fails that mutation only.
+    ``observer``, if given, is called with each mutation, the seconds spent on
+    its final attempt and whether it succeeded.
+
+    The concurrency slot is only held around ``perform``: waiting for a
+    route's budget or sleeping on a 429 backoff does not block mutations on
+    other routes. :meth:`lane` makes a lower-priority executor for bulk work
+    that shares the route budgets but leaves ``route_reserve`` tokens of each
+    route for this one.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_concurrency: int = 8,
+        route_capacity: float = 5,
+        route_refill_per_second: float = 1.0,
+        max_retries: int = 3,
+        base_backoff: float = 1.0,
+        perform: Callable[[RoleMutation], Awaitable[None]] = discord_perform,
+        route_key: Callable[[RoleMutation], Hashable] = default_route_key,
+        observer: Optional[Callable[[RoleMutation, float, bool], None]] = None,
+        route_reserve: float = 0,
+        routes: Optional[Dict[Hashable, _RouteBudget]] = None,
+    ):
+        self.max_concurrency = max_concurrency
+        self.route_capacity = route_capacity
+        self.route_refill_per_second = route_refill_per_second
+        self.max_retries = max_retries
+        self.base_backoff = base_backoff
+        self.perform = perform
+        self.route_key = route_key
+        self.observer = observer
+        self.route_reserve = route_reserve
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._routes: Dict[Hashable, _RouteBudget] = routes if routes is not None else {}
+        self._route_locks: Dict[Hashable, asyncio.Lock] = {}  # Per lane, so a waiting bulk lane never blocks this one
+
+    def lane(self, *, max_concurrency: int, route_reserve: float) -> "RoleExecutor":
+        """Return a lower-priority executor sharing this one's route budgets.
+
+        The lane only takes a route token while more than ``route_reserve``
+        remain, so mutations on this executor are not queued behind it.
+        """
+        return RoleExecutor(
+            max_concurrency=max_concurrency,
+            route_capacity=self.route_capacity,
+            route_refill_per_second=self.route_refill_per_second,
+            max_retries=self.max_retries,
+            base_backoff=self.base_backoff,
+            perform=self.perform,
+            route_key=self.route_key,
+            observer=self.observer,
+            route_reserve=route_reserve,
+            routes=self._routes,
+        )
+
+    async def _acquire_route(self, key: Hashable) -> None:
+        budget = self._routes.get(key)
+        if budget is None:
+            budget = self._routes[key] = _RouteBudget(self.route_capacity)
+        lock = self._route_locks.get(key)
+        if lock is None:
+            lock = self._route_locks[key] = asyncio.Lock()
+        needed = 1 + self.route_reserve
+        async with lock:
+            while True:
+                now = time.monotonic()
+                budget.tokens = min(
+                    self.route_capacity,
+                    budget.tokens + (now - budget.updated) * self.route_refill_per_second,
+                )
+                budget.updated = now
+                if budget.tokens >= needed:
+                    budget.tokens -= 1
+                    return
+                await asyncio.sleep((needed - budget.tokens) / self.route_refill_per_second)
+
+    def _drain_route(self, key: Hashable) -> None:
+        """Empty a route's bucket after Discord told us it is exhausted."""
+        budget = self._routes.get(key)
+        if budget is not None:
+            budget.tokens = 0
+            budget.updated = time.monotonic()
+
+    async def _apply(self, mutation: RoleMutation) -> RoleMutationResult:
+        key = self.route_key(mutation)
+        attempts = 0
+        while True:
+            attempts += 1
+            await self._acquire_route(key)
+            async with self._semaphore:
+                start = time.perf_counter()
+                try:
+                    await self.perform(mutation)
+                    self._observe(mutation, start, True)
+                    return RoleMutationResult(mutation, True, attempts)
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    if getattr(e, "status", None) != 429 or attempts > self.max_retries:
+                        self._observe(mutation, start, False)
+                        return RoleMutationResult(mutation, False, attempts, e)
+                    error = e
+            self._drain_route(key)
+            retry_after = getattr(error, "retry_after", None)
+            if retry_after is None:
+                retry_after = self.base_backoff * (2 ** (attempts - 1)) * (1 + random.random() / 4)
+            log.debug(f"Rate limited on {key}, retrying in {retry_after:.2f}s")
+            await asyncio.sleep(retry_after)
+
+    def _observe(self, mutation: RoleMutation, start: float, ok: bool) -> None:
+        if self.observer is not None:
+            self.observer(mutation, time.perf_counter() - start, ok)
+
+    async def run(self, mutations: Iterable[RoleMutation]) -> FanOutResult:
+        """Apply every mutation and return one aggregated result."""
+        start = time.monotonic()
+        results = await asyncio.gather(*(self._apply(mutation) for mutation in mutations))
+        return FanOutResult(list(results), time.monotonic() - start)
@@ -0,0 +1,97 @@
+import hashlib
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+
+
+def token_fingerprint(token: str) -> str:
+    """Stable key for a raw token that avoids keeping the token itself in memory."""
+    return hashlib.sha256(token.encode("utf-8", "surrogatepass")).hexdigest()
+
+
+class ReplayCache:
+    """Bounded store of verification outcomes keyed by token hash or ``jti``.
+
+    Every entry lives for the same ``ttl``, so insertion order is also expiry
+    order and eviction only ever looks at the oldest entries. When the cache is
+    full the oldest entry is dropped regardless of age.
+    """
+
+    __slots__ = ("maxsize", "ttl", "_entries")
+
+    def __init__(self, maxsize: int = 10000, ttl: float = 1800):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+
+    def _evict(self, now: float) -> None:
+        while self._entries:
+            key, (expires_at, _) = next(iter(self._entries.items()))
+            if expires_at > now and len(self._entries) <= self.maxsize:
+                break
+            del self._entries[key]
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            return None
+        return value
+
+    def put(self, key: Hashable, value: Any) -> None:
+        now = time.monotonic()
+        self._entries.pop(key, None)
+        self._entries[key] = (now + self.ttl, value)
+        self._evict(now)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class TokenBuckets:
+    """Per-key token buckets allowing ``per_minute`` requests with bursts of the same size.
+
+    Only the ``maxsize`` most recently seen keys are tracked, so a flood of
+    distinct keys cannot grow memory without bound; a forgotten key starts
+    again with a full bucket. A limit of 0 disables the buckets.
+    """
+
+    __slots__ = ("per_minute", "maxsize", "_buckets")
+
+    def __init__(self, per_minute: float, maxsize: int = 10000):
+        self.per_minute = per_minute
+        self.maxsize = maxsize
+        self._buckets: "OrderedDict[Hashable, list]" = OrderedDict()
+
+    def configure(self, per_minute: float) -> None:
+        self.per_minute = per_minute
+        self._buckets.clear()
+
+    def acquire(self, key: Hashable) -> float:
+        """Take a token for ``key``; return 0 on success or the seconds until one is available."""
+        if self.per_minute <= 0:
+            return 0.0
+        now = time.monotonic()
+        refill = self.per_minute / 60
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = self._buckets[key] = [self.per_minute, now]
+            if len(self._buckets) > self.maxsize:
+                self._buckets.popitem(last=False)
+        else:
+            self._buckets.move_to_end(key)
+            bucket[0] = min(self.per_minute, bucket[0] + (now - bucket[1]) * refill)
+            bucket[1] = now
+        if bucket[0] >= 1:
+            bucket[0] -= 1
+            return 0.0
+        return (1 - bucket[0]) / refill
+
+    def __len__(self) -> int:
+        return len(self._buckets)
@@ -0,0 +1,63 @@
+import logging
+
+log = logging.getLogger("red.reediculous-cogs.web_verifier.storage")
+
+VERIFIED_MEMBER_GROUP = "VERIFIED_MEMBER"
+INCORRECT_ANSWER_GROUP = "INCORRECT_ANSWER"
+
+VERIFIED_MEMBER_DEFAULTS = {
+    "member_id": None,
+}
+
+INCORRECT_ANSWER_DEFAULTS = {
+    "count": 0,
+    "original_forms": [],
+    "first_seen": 0,
+    "last_seen": 0,
+    "users": [],
+}
+
+
+def register_storage(config) -> None:
+    """Register the per-key custom groups that hold verified members and incorrect answers.
+
+    Each verified member is stored under its user ID and each incorrect answer
+    under its normalized form, so saving or removing one record writes one key
+    instead of re-serializing a mapping of every record.
+    """
+    config.init_custom(VERIFIED_MEMBER_GROUP, 1)
+    config.register_custom(VERIFIED_MEMBER_GROUP, **VERIFIED_MEMBER_DEFAULTS)
+    config.init_custom(INCORRECT_ANSWER_GROUP, 1)
+    config.register_custom(INCORRECT_ANSWER_GROUP, **INCORRECT_ANSWER_DEFAULTS)
+
+
+async def migrate_global_blobs(config) -> None:
+    """Move the legacy ``verified_members`` and ``incorrect_answers`` globals into the custom groups.
+
+    Runs once per blob: the blob is cleared after its records are copied, and
+    records already present in a custom group win over the blob, so an
+    interrupted migration is safe to repeat.
+    """
+    verified_members = await config.verified_members()
+    if verified_members:
+        existing = await config.custom(VERIFIED_MEMBER_GROUP).all()
+        records = {user_id: {"member_id": member_id} for user_id, member_id in verified_members.items()}
+        records.update(existing)
+        await config.custom(VERIFIED_MEMBER_GROUP).set(records)
+        await config.verified_members.clear()
+        log.info(f"Migrated {len(verified_members)} verified member(s) to per-user storage")
+
+    incorrect_answers = await config.incorrect_answers()
+    if incorrect_answers:
+        existing = await config.custom(INCORRECT_ANSWER_GROUP).all()
+        records = dict(incorrect_answers)
+        records.update(existing)
+        await config.custom(INCORRECT_ANSWER_GROUP).set(records)
+        await config.incorrect_answers.clear()
+        log.info(f"Migrated {len(incorrect_answers)} incorrect answer(s) to per-answer storage")
+
+
+async def load_verified_members(config):
+    """Return every stored ``str(user_id) -> member_id`` mapping."""
+    records = await config.custom(VERIFIED_MEMBER_GROUP).all()
+    return {user_id: record["member_id"] for user_id, record in records.items() if record.get("member_id") is not None}
@@ -1,16 +1,52 @@
 import discord
 import asyncio
-import re
+import csv
+import hmac
+import io
+import tempfile
 import jwt
 import time
+import uuid
+import json
 import logging
+import math
+from typing import Optional
+import aiohttp
 from aiohttp import web
 from redbot.core import commands, Config
 from redbot.core.bot import Red
 from discord.utils import get
 
+from .answers import compile_answers, normalize_answer
+from .backfill import RoleBackfill, new_backfill_state
+from .dm_router import DMRouter
+from .incorrect_answers import IncorrectAnswerLog, guild_counts, unique_user_count
+from .indexes import GuildMembershipIndex, GuildSettings, VerifiedMemberIndex
+from .jobs import JOB_DEFAULTS, JOB_GROUP, VerificationJobQueue
+from .metrics import VerificationMetrics
+from .role_executor import RoleExecutor, RoleMutation
+from .security import ReplayCache, TokenBuckets, token_fingerprint
+from .storage import VERIFIED_MEMBER_GROUP, load_verified_members, migrate_global_blobs, register_storage
+
 log = logging.getLogger("red.reediculous-cogs.web_verifier")
 
+MAX_BATCH_SIZE = 10000  # Items accepted by a single /discord-auth/return/batch request
+IMPORT_BATCH_SIZE = 1000  # Rows verifyconfig import collects before saving them
+CONFIG_WRITE_CONCURRENCY = 32  # Verified member keys written at once by bulk saves
+BATCH_MAX_BODY_SIZE = 4 * 1024 * 1024  # Bytes accepted by /discord-auth/return/batch, enough for MAX_BATCH_SIZE tokens
+VERIFICATION_ROUTES = ("/discord-auth/return", "/discord-auth/return/batch")
+VIEWMEMBERS_PAGE_SIZE = 20  # Members per viewmembers embed page
+
+
+class VerificationError(Exception):
+    """A verification request was rejected; ``status`` is the HTTP status to answer with."""
+
+    def __init__(self, message: str, status: int, retry_after: float = None):
+        super().__init__(message)
+        self.status = status
+        self.retry_after = retry_after
+
+
 class WebVerifier(commands.Cog):
     """A cog that handles user verification with JWT tokens and web requests."""
 
@@ -28,35 +64,360 @@ class WebVerifier(commands.Cog):
             "kick_on_fail": False,
             "verification_enabled": False,
             "verify_on_join": True,
+            "backfill": None,  # Cursor and counters of an unfinished verified role backfill
         }
         default_global = {
             "question": {},
             "verification_url": "",
             "jwt_secret": None,
             "port": 8080,  # Default port for the web server
-            "verified_members": {},  # Store user_id -> member_id mappings (now global)
-            "incorrect_answers": {},  # Store normalized incorrect answers with counts and timestamps
+            "verified_members": {},  # Legacy blob, migrated to the VERIFIED_MEMBER group on load
+            "incorrect_answers": {},  # Legacy blob, migrated to the INCORRECT_ANSWER group on load
             "temp_member_seed": 100000000,
+            "async_verification": False,  # Answer /discord-auth/return with 202 and process in the background
+            "metrics_token": None,  # Bearer token required by /metrics when set
+            "max_body_size": 16384,  # Bytes accepted by /discord-auth/return
+            "max_in_flight": 64,  # Verification requests handled at once before shedding with 429
+            "ip_rate_limit": 0,  # Verification requests per minute per client IP, 0 to disable
+            "user_rate_limit": 10,  # Verifications per minute per user_id, 0 to disable
+            "trust_forwarded_for": False,  # Take the client IP from X-Forwarded-For (behind a reverse proxy)
+            "forwarded_for_hops": 1,  # Trusted proxies in front of the bot; the client IP is this many entries from the right
         }
         self.config.register_guild(**default_guild)
         self.config.register_global(**default_global)
+        self.config.init_custom(JOB_GROUP, 1)
+        self.config.register_custom(JOB_GROUP, **JOB_DEFAULTS)
+        register_storage(self.config)
         self.web_app = None
         self.web_runner = None
+        self.verified_index = VerifiedMemberIndex()
+        self._global_question = {}
+        self._global_answers = frozenset()
+        self._default_guild_settings = GuildSettings()
+        self._guild_settings = {}  # guild_id -> GuildSettings
+        self._enabled_guild_ids = set()
+        self._verified_role_ids = {}  # guild_id -> verified role ID, only for enabled guilds with a role set
+        self.membership_index = GuildMembershipIndex()
+        self._startup_task = None
+        self._backfills = {}  # guild_id -> RoleBackfill
+        self._saved_backfills = {}  # guild_id -> backfill state to resume once ready
+        self.metrics = VerificationMetrics()
+        self.incorrect_log = IncorrectAnswerLog(self.config)
+        self._metrics_token = None
+        self.role_executor = RoleExecutor(observer=self.observe_role_mutation)
+        self.backfill_executor = self.role_executor.lane(max_concurrency=2, route_reserve=2)
+        self.job_queue = VerificationJobQueue(self.config, self.process_verification)
+        self._async_verification = False
+        self._jwt_secret = None
+        self.replay_cache = ReplayCache()
+        self._pending_verifications = {}  # token fingerprint -> Future of the first submission
+        self.dm_router = DMRouter()
+        self._max_body_size = 16384
+        self._max_in_flight = 64
+        self._trust_forwarded_for = False
+        self._forwarded_for_hops = 1
+        self._verifications_in_flight = 0
+        self.ip_buckets = TokenBuckets(0)
+        self.user_buckets = TokenBuckets(10)
 
     async def cog_load(self):
-        """Start the web server when the cog loads."""
+        """Load the in-memory indexes and start the web server when the cog loads."""
+        await migrate_global_blobs(self.config)
+        self.verified_index.load(await load_verified_members(self.config))
+        await self.load_guild_settings()
+        self._async_verification = await self.config.async_verification()
+        self._jwt_secret = await self.config.jwt_secret()
+        self._metrics_token = await self.config.metrics_token()
+        await self.load_limits()
+        self._startup_task = asyncio.create_task(self.after_ready())
+        await self.job_queue.load()
+        await self.incorrect_log.start()
         await self.start_web_server()
 
     async def cog_unload(self):
-        """Stop the web server when the cog unloads."""
+        """Stop the web server and job workers when the cog unloads."""
+        if self._startup_task:
+            self._startup_task.cancel()
+        for backfill in self._backfills.values():
+            backfill.cancel()  # The saved cursor lets it resume on the next load
         await self.stop_web_server()
+        await self.job_queue.stop()
+        await self.incorrect_log.stop()
+        self.dm_router.deadlines.close()
+
+    async def after_ready(self):
+        """Build the membership index, start the job workers and resume saved backfills once the member cache is populated."""
+        await self.bot.wait_until_red_ready()
+        self.build_membership_index()
+        self.job_queue.start_workers()
+        for guild_id, state in self._saved_backfills.items():
+            guild = self.bot.get_guild(guild_id)
+            if guild is not None and guild_id not in self._backfills:
+                log.info(f"Resuming verified role backfill in {guild.name} from member {state['cursor']}")
+                self.start_backfill(guild, state)
+        self._saved_backfills = {}
+
+    async def load_limits(self):
+        """Cache the web server's overload limits so the request path never reads Config."""
+        self._max_body_size = await self.config.max_body_size()
+        self._max_in_flight = await self.config.max_in_flight()
+        self._trust_forwarded_for = await self.config.trust_forwarded_for()
+        self._forwarded_for_hops = await self.config.forwarded_for_hops()
+        self.ip_buckets.configure(await self.config.ip_rate_limit())
+        self.user_buckets.configure(await self.config.user_rate_limit())
+
+    def build_membership_index(self):
+        """Build the user -> guilds index from the member cache."""
+        self.membership_index.clear()
+        for guild in self.enabled_guilds():
+            self.membership_index.add_guild(guild.id, (member.id for member in guild.members))
+        self.membership_index.ready = True
+        log.debug(f"Membership index built for {len(self.membership_index)} users")
+
+    def member_guilds(self, user_id: int):
+        """Yield (guild, member) for every verification-enabled guild the user is in."""
+        if self.membership_index.ready:
+            guild_ids = tuple(self.membership_index.guilds_for(user_id))
+        else:
+            # Index is still being built; scan the enabled guilds instead
+            guild_ids = tuple(self._enabled_guild_ids)
+        for guild_id in guild_ids:
+            guild = self.bot.get_guild(guild_id)
+            member = guild.get_member(user_id) if guild else None
+            if member is not None:
+                yield guild, member
+
+    async def load_guild_settings(self):
+        """Build settings snapshots for every guild with stored configuration."""
+        self._global_question = await self.config.question()
+        self._global_answers = compile_answers(self._global_question.get("answers", []))
+        self._default_guild_settings = GuildSettings().with_global_question(self._global_question, self._global_answers)
+        all_guilds = await self.config.all_guilds()
+        self._guild_settings = {
+            guild_id: GuildSettings.from_config(guild_data, self._global_question, self._global_answers)
+            for guild_id, guild_data in all_guilds.items()
+        }
+        self._enabled_guild_ids = {
+            guild_id for guild_id, settings in self._guild_settings.items() if settings.enabled
+        }
+        self._verified_role_ids = {
+            guild_id: settings.role_id
+            for guild_id, settings in self._guild_settings.items()
+            if settings.enabled and settings.role_id
+        }
+        self._saved_backfills = {
+            guild_id: guild_data["backfill"] for guild_id, guild_data in all_guilds.items() if guild_data.get("backfill")
+        }
+
+    def guild_settings(self, guild: discord.Guild) -> GuildSettings:
+        """Return the cached settings snapshot for a guild without touching Config."""
+        return self._guild_settings.get(guild.id, self._default_guild_settings)
+
+    async def invalidate_guild_settings(self, guild: discord.Guild):
+        """Re-read a guild's settings after a `verifyset` command changed them."""
+        with self.metrics.config_seconds.time("read"):
+            guild_data = await self.config.guild(guild).all()
+        settings = GuildSettings.from_config(guild_data, self._global_question, self._global_answers)
+        self._guild_settings[guild.id] = settings
+        if settings.enabled and settings.role_id:
+            self._verified_role_ids[guild.id] = settings.role_id
+        else:
+            self._verified_role_ids.pop(guild.id, None)
+        if settings.enabled and guild.id not in self._enabled_guild_ids:
+            self._enabled_guild_ids.add(guild.id)
+            self.membership_index.add_guild(guild.id, (member.id for member in guild.members))
+        elif not settings.enabled and guild.id in self._enabled_guild_ids:
+            self._enabled_guild_ids.discard(guild.id)
+            self.membership_index.remove_guild(guild.id)
+
+    async def invalidate_global_question(self):
+        """Re-resolve every snapshot after the global question changed."""
+        self._global_question = await self.config.question()
+        self._global_answers = compile_answers(self._global_question.get("answers", []))
+        self._default_guild_settings = self._default_guild_settings.with_global_question(
+            self._global_question, self._global_answers
+        )
+        self._guild_settings = {
+            guild_id: settings.with_global_question(self._global_question, self._global_answers)
+            for guild_id, settings in self._guild_settings.items()
+        }
+
+    def enabled_guilds(self):
+        """Yield the guilds the bot is in where verification is enabled."""
+        for guild_id in tuple(self._enabled_guild_ids):
+            guild = self.bot.get_guild(guild_id)
+            if guild is not None:
+                yield guild
+
+    async def store_verified_member(self, user_id: int, member_id):
+        """Save one user's member ID under its own key and mirror it in the index."""
+        with self.metrics.config_seconds.time("write"):
+            await self.config.custom(VERIFIED_MEMBER_GROUP, str(user_id)).member_id.set(member_id)
+        self.verified_index.set(user_id, member_id)
+
+    async def store_verified_members(self, updates):
+        """Save ``user_id -> member_id`` updates, writing only the changed keys.
+
+        At most ``CONFIG_WRITE_CONCURRENCY`` writes are in flight at once, so a
+        large import does not flood the Config driver.
+        """
+        items = list(updates.items())
+        for start in range(0, len(items), CONFIG_WRITE_CONCURRENCY):
+            await asyncio.gather(
+                *(self.store_verified_member(user_id, member_id) for user_id, member_id in items[start:start + CONFIG_WRITE_CONCURRENCY])
+            )
+
+    async def remove_verified_member(self, user_id: int):
+        """Delete one user's verification record and drop it from the index."""
+        with self.metrics.config_seconds.time("write"):
+            await self.config.custom(VERIFIED_MEMBER_GROUP, str(user_id)).clear()
+        self.verified_index.discard(user_id)
+
+    def verified_role_mutations(self, user_id: int, add: bool, exclude_guild_id: int = None, reason: str = None):
+        """Build the verified-role changes needed for a user across every enabled guild.
+
+        Returns a list of (guild, member) pairs the user is in and the mutations
+        that actually change something.
+        """
+        guild_members = []
+        mutations = []
+        for guild, guild_member in self.member_guilds(user_id):
+            if guild.id == exclude_guild_id:
+                continue
+            guild_members.append((guild, guild_member))
+            role_id = self.guild_settings(guild).role_id
+            role = guild.get_role(role_id) if role_id else None
+            if role and (role in guild_member.roles) != add:
+                mutations.append(RoleMutation(guild, guild_member, role, add, reason))
+        return guild_members, mutations
+
+    async def apply_role_mutations(self, mutations, executor: RoleExecutor = None):
+        """Run role mutations through the shared executor, or a lane of it, and log any failures."""
+        result = await (executor or self.role_executor).run(mutations)
+        for failure in result.failed:
+            guild, member = failure.mutation.guild, failure.mutation.member
+            action = "grant verified role to" if failure.mutation.add else "remove verified role from"
+            if isinstance(failure.error, discord.Forbidden):
+                log.warning(f"Could not {action} {member} in {guild.name} - missing permissions")
+            else:
+                log.error(f"Could not {action} {member} in {guild.name}: {failure.error}")
+        return result
+
+    def observe_role_mutation(self, mutation: RoleMutation, elapsed: float, ok: bool):
+        """Record a role executor result in the metrics."""
+        self.metrics.role_grant_seconds.observe(
+            elapsed, mutation.guild.id, "add" if mutation.add else "remove", "ok" if ok else "error"
+        )
+
+    @web.middleware
+    async def metrics_middleware(self, request, handler):
+        """Count requests by status code and track in-flight requests and latency."""
+        route = request.match_info.route.resource
+        route = route.canonical if route is not None else "unmatched"
+        metrics = self.metrics
+        metrics.in_flight.inc()
+        start = time.perf_counter()
+        status = 500
+        try:
+            response = await handler(request)
+            status = response.status
+            return response
+        except web.HTTPException as e:
+            status = e.status
+            raise
+        finally:
+            metrics.in_flight.dec()
+            metrics.request_seconds.observe(time.perf_counter() - start, route)
+            metrics.requests.inc(route, status)
+
+    @staticmethod
+    def too_many_requests(retry_after: float, text: str = "Too many requests") -> web.Response:
+        return web.Response(text=text, status=429, headers={"Retry-After": str(max(1, math.ceil(retry_after)))})
+
+    def client_ip(self, request) -> str:
+        """The client address, taken from X-Forwarded-For when the bot is behind trusted proxies.
+
+        Proxies append the address they saw to whatever the client sent, so
+        only the last ``forwarded_for_hops`` entries were written by our own
+        proxies; the left-most of those is the real client.
+        """
+        if self._trust_forwarded_for:
+            entries = [entry.strip() for entry in request.headers.get("X-Forwarded-For", "").split(",") if entry.strip()]
+            if entries:
+                return entries[-min(self._forwarded_for_hops, len(entries))]
+        return request.remote or "unknown"
+
+    @web.middleware
+    async def overload_middleware(self, request, handler):
+        """Shed excess requests before their body is read or Config is touched.
+
+        Only verification routes are limited: job status polling and metrics
+        scrapes are cheap and are not charged against the verification
+        budget. Verification requests are rate limited per client IP when
+        `ip_rate_limit` is set, rejected when oversized by Content-Length and
+        capped at `max_in_flight` concurrent requests.
+        """
+        if request.path not in VERIFICATION_ROUTES:
+            return await handler(request)
+
+        retry_after = self.ip_buckets.acquire(self.client_ip(request))
+        if retry_after:
+            self.metrics.requests_shed.inc("ip_rate_limit")
+            return self.too_many_requests(retry_after)
+
+        max_body_size = BATCH_MAX_BODY_SIZE if request.path.endswith("/batch") else self._max_body_size
+        if request.content_length is not None and request.content_length > max_body_size:
+            self.metrics.requests_shed.inc("body_size")
+            return web.Response(text="Request body too large", status=413)
+
+        if self._verifications_in_flight >= self._max_in_flight:
+            self.metrics.requests_shed.inc("in_flight")
+            return self.too_many_requests(1, "Server busy, try again shortly")
+
+        self._verifications_in_flight += 1
+        try:
+            return await handler(request)
+        finally:
+            self._verifications_in_flight -= 1
+
+    async def handle_metrics(self, request):
+        """Expose the metrics in the Prometheus text format."""
+        if self._metrics_token and not hmac.compare_digest(
+            request.headers.get("Authorization", "").encode(), f"Bearer {self._metrics_token}".encode()
+        ):
+            return web.Response(text="Unauthorized", status=401, headers={"WWW-Authenticate": "Bearer"})
+        self.metrics.armed_deadlines.set(len(self.dm_router.deadlines))
+        return web.Response(text=self.metrics.render(), content_type="text/plain", charset="utf-8")
+
+    def start_backfill(self, guild: discord.Guild, state):
+        """Start granting the verified role to already verified members of a guild in the background."""
+        backfill = RoleBackfill(self, guild, state)
+        self._backfills[guild.id] = backfill
+        backfill.start()
+        return backfill
+
+    async def finish_backfill(self, guild: discord.Guild):
+        """Forget a guild's backfill and its saved cursor."""
+        self._backfills.pop(guild.id, None)
+        await self.config.guild(guild).backfill.set(None)
+
+    def build_web_app(self) -> web.Application:
+        """Create the aiohttp application with every verification route."""
+        # client_max_size bounds bodies sent without a Content-Length; the middleware enforces per-route limits
+        app = web.Application(
+            middlewares=[self.metrics_middleware, self.overload_middleware], client_max_size=BATCH_MAX_BODY_SIZE
+        )
+        app.router.add_get("/", lambda request: web.Response(text="You do not have access to this page!"))
+        app.router.add_post("/discord-auth/return", self.handle_verification)
+        app.router.add_post("/discord-auth/return/batch", self.handle_batch_verification)
+        app.router.add_get("/discord-auth/status/{job_id}", self.handle_job_status)
+        app.router.add_get("/metrics", self.handle_metrics)
+        return app
 
     async def start_web_server(self):
         """Start the aiohttp web server for handling verification requests."""
         try:
-            self.web_app = web.Application()
-            self.web_app.router.add_get("/", lambda request: web.Response(text="You do not have access to this page!"))
-            self.web_app.router.add_post("/discord-auth/return", self.handle_verification)
+            self.web_app = self.build_web_app()
             self.web_runner = web.AppRunner(self.web_app)
             await self.web_runner.setup()
             port = await self.config.port()
@@ -84,106 +445,303 @@ class WebVerifier(commands.Cog):
         if not jwt_token:
             return web.Response(text="Missing JWT token", status=400)
 
+        # Replays and double submissions share the outcome of the first submission
+        token_key = token_fingerprint(jwt_token)
+        outcome = self.replay_cache.get(token_key)
+        if outcome is None:
+            pending = self._pending_verifications.get(token_key)
+            if pending is not None:
+                outcome = await asyncio.shield(pending)
+            else:
+                pending = asyncio.get_running_loop().create_future()
+                self._pending_verifications[token_key] = pending
+                try:
+                    outcome = await self.run_verification(jwt_token, token_key)
+                    pending.set_result(outcome)
+                except asyncio.CancelledError:
+                    pending.cancel()
+                    raise
+                finally:
+                    del self._pending_verifications[token_key]
+
+        status, body = outcome
+        if status == 429 and isinstance(body, dict):
+            return web.json_response(body, status=status, headers={"Retry-After": str(body["retry_after"])})
+        if isinstance(body, dict):
+            return web.json_response(body, status=status)
+        return web.Response(text=body, status=status)
+
+    async def run_verification(self, jwt_token: str, token_key: str):
+        """Verify a token and return its (status, body) outcome.
+
+        Successful outcomes are remembered under the token hash and the token's
+        `jti` so replays of the same token are answered from the cache.
+        """
+        jti = None
         try:
-            secret = await self.config.jwt_secret()
-            try:
+            payload = await self.decode_verification_token(jwt_token)
+            jti = payload.get("jti")
+            if jti:
+                outcome = self.replay_cache.get(f"jti:{jti}")
+                if outcome is not None:
+                    return outcome
+            # Counted only for correctly signed tokens, so forged ones cannot lock a user out
+            retry_after = self.user_buckets.acquire(payload["user_id"])
+            if retry_after:
+                self.metrics.requests_shed.inc("user_rate_limit")
+                raise VerificationError("Too many verification attempts for this user", 429, retry_after)
+            if self._async_verification:
+                job_id = await self.job_queue.submit(payload)
+                outcome = 202, {"job_id": job_id, "status": "queued", "status_url": f"/discord-auth/status/{job_id}"}
+            else:
+                outcome = await self.process_verification(payload)
+        except VerificationError as e:
+            if e.retry_after:
+                return e.status, {"error": str(e), "retry_after": max(1, math.ceil(e.retry_after))}
+            return e.status, str(e)
+        except Exception as e:
+            return 500, f"Server error: {str(e)}"
+
+        if outcome[0] < 400:
+            self.replay_cache.put(token_key, outcome)
+            if jti:
+                self.replay_cache.put(f"jti:{jti}", outcome)
+        return outcome
+
+    async def handle_job_status(self, request):
+        """Report the progress of a queued verification job."""
+        job_id = request.match_info["job_id"]
+        job = self.job_queue.get(job_id)
+        if job is None:
+            return web.json_response({"job_id": job_id, "error": "Job not found"}, status=404)
+
+        return web.json_response({
+            "job_id": job_id,
+            "status": job["status"],
+            "created_at": job["created_at"],
+            "started_at": job["started_at"],
+            "finished_at": job["finished_at"],
+            "result": job["result"],
+        })
+
+    async def decode_verification_token(self, jwt_token: str):
+        """Validate a returned JWT and extract the verification payload.
+
+        Raises VerificationError with the HTTP status to answer with if the token
+        is invalid or refers to a guild or member the bot cannot see.
+        """
+        try:
+            with self.metrics.jwt_decode_seconds.time():
                 decoded_payload = jwt.decode(
-                    jwt_token, secret, algorithms=["HS256"]
+                    jwt_token, self._jwt_secret, algorithms=["HS256"]
                 )
-                guild_id = decoded_payload.get("guild_id")
-            except jwt.InvalidTokenError:
-                return web.Response(text="Invalid JWT token", status=401)
-
-            if not decoded_payload or not guild_id:
-                return web.Response(text="Invalid JWT token", status=401)
+        except jwt.ExpiredSignatureError:
+            raise VerificationError("JWT token has expired", 401)
+        except jwt.InvalidTokenError:
+            raise VerificationError("Invalid JWT token", 401)
 
-            # Extract data from JWT - member_id should be in the payload now
-            # Convert IDs to integers to ensure compatibility with discord.py
-            try:
-                user_id = int(decoded_payload.get("user_id"))
-                guild_id = int(guild_id)
-            except (ValueError, TypeError):
-                return web.Response(text="Invalid user_id or guild_id in JWT", status=400)
+        return self.validate_verification_claims(decoded_payload)
 
-            username = decoded_payload.get("username")
-            member_id = decoded_payload.get("member_id")
+    def validate_verification_claims(self, decoded_payload):
+        """Check the claims of a verified token and normalise them into a payload."""
+        guild_id = decoded_payload.get("guild_id") if isinstance(decoded_payload, dict) else None
+        if not decoded_payload or not guild_id:
+            raise VerificationError("Invalid JWT token", 401)
 
-            if not all([user_id, username, guild_id]):
-                return web.Response(text="Missing required fields in JWT", status=400)
+        # Extract data from JWT - member_id should be in the payload now
+        # Convert IDs to integers to ensure compatibility with discord.py
+        try:
+            user_id = int(decoded_payload.get("user_id"))
+            guild_id = int(guild_id)
+        except (ValueError, TypeError):
+            raise VerificationError("Invalid user_id or guild_id in JWT", 400)
+
+        username = decoded_payload.get("username")
+        member_id = decoded_payload.get("member_id")
+
+        if not all([user_id, username, guild_id]):
+            raise VerificationError("Missing required fields in JWT", 400)
+
+        if not member_id:
+            raise VerificationError("Missing member_id in JWT payload", 400)
+
+        # Find the guild and user
+        guild = self.bot.get_guild(guild_id)
+        if not guild:
+            raise VerificationError("Guild not found", 404)
+
+        if not guild.get_member(user_id):
+            raise VerificationError("Member not found", 404)
+
+        return {
+            "user_id": user_id,
+            "guild_id": guild_id,
+            "username": username,
+            "member_id": member_id,
+            "jti": decoded_payload.get("jti"),
+        }
 
-            if not member_id:
-                return web.Response(
-                    text="Missing member_id in JWT payload", status=400
-                )
+    async def handle_batch_verification(self, request):
+        """Verify many users in one request and stream per-item results as NDJSON.
 
-            # Find the guild and user
-            guild = self.bot.get_guild(guild_id)
-            if not guild:
-                return web.Response(text="Guild not found", status=404)
-
-            member = guild.get_member(user_id)
-            if not member:
-                return web.Response(text="Member not found", status=404)
+        The body is either `{"jwts": [...]}` with individually signed tokens, or
+        `{"batch": "<jwt>"}` whose `items` claim lists the payloads. Every
+        member ID is saved under its own Config key, then the
+        role grants for all items are scheduled together. Batch items are not
+        sent a DM.
+        """
+        try:
+            data = await request.json()
+        except Exception:
+            return web.Response(text="Invalid JSON body", status=400)
 
-            # Save the member ID for this user
-            async with self.config.verified_members() as verified_members:
-                verified_members[str(user_id)] = member_id
+        signed_batch = isinstance(data, dict) and bool(data.get("batch"))
+        if signed_batch:
+            try:
+                with self.metrics.jwt_decode_seconds.time():
+                    claims = jwt.decode(data["batch"], self._jwt_secret, algorithms=["HS256"])
+            except jwt.ExpiredSignatureError:
+                return web.Response(text="JWT token has expired", status=401)
+            except jwt.InvalidTokenError:
+                return web.Response(text="Invalid JWT token", status=401)
+            items = claims.get("items")
+        else:
+            items = data.get("jwts") if isinstance(data, dict) else None
 
-            await self.complete_verification(guild, member, member_id)
+        if not isinstance(items, list) or not items:
+            return web.Response(text="Missing jwts or batch items", status=400)
+        if len(items) > MAX_BATCH_SIZE:
+            return web.Response(text=f"Batch exceeds {MAX_BATCH_SIZE} items", status=413)
 
-            # Grant the verified role in ALL other servers where this user exists and verification is enabled
-            servers_updated = [guild.name]
-            for other_guild in self.bot.guilds:
-                if other_guild.id == guild.id:
-                    continue  # Skip the originating guild
+        response = web.StreamResponse(headers={"Content-Type": "application/x-ndjson"})
+        await response.prepare(request)
 
-                other_member = other_guild.get_member(user_id)
-                if not other_member:
-                    continue  # User not in this server
+        async def write(result):
+            await response.write((json.dumps(result) + "\n").encode())
 
-                verification_enabled = await self.config.guild(other_guild).verification_enabled()
-                if not verification_enabled:
-                    continue  # Verification not enabled in this server
+        valid = {}  # user_id -> (index, payload)
+        for index, item in enumerate(items):
+            try:
+                if signed_batch:
+                    payload = self.validate_verification_claims(item)
+                elif isinstance(item, str):
+                    payload = await self.decode_verification_token(item)
+                else:
+                    raise VerificationError("Invalid JWT token", 401)
+            except VerificationError as e:
+                await write({"index": index, "status": e.status, "message": str(e)})
+                continue
 
-                other_role_id = await self.config.guild(other_guild).role_id()
-                other_role = get(other_guild.roles, id=other_role_id) if other_role_id else None
+            previous = valid.get(payload["user_id"])
+            if previous is not None:
+                await write({
+                    "index": previous[0],
+                    "user_id": str(payload["user_id"]),
+                    "status": 409,
+                    "message": f"Superseded by item {index}",
+                })
+            valid[payload["user_id"]] = (index, payload)
+
+        if valid:
+            await self.store_verified_members({user_id: payload["member_id"] for user_id, (_, payload) in valid.items()})
+
+            tasks = [self.grant_batch_item(index, payload) for index, payload in valid.values()]
+            for task in asyncio.as_completed(tasks):
+                await write(await task)
+
+        await response.write_eof()
+        return response
+
+    async def grant_batch_item(self, index: int, payload):
+        """Grant the verified role everywhere for one already-stored batch item."""
+        user_id = payload["user_id"]
+        member_id = payload["member_id"]
+        result = {"index": index, "user_id": str(user_id), "member_id": member_id}
+        try:
+            guild_members, mutations = self.verified_role_mutations(user_id, add=True, exclude_guild_id=payload["guild_id"])
 
-                servers_updated.append(other_guild.name)
-                # Dispatch verification event for this server too
-                self.bot.dispatch('member_verified', other_guild, other_member, member_id)
+            # Like complete_verification, the originating guild is granted its role regardless of enabled state
+            guild = self.bot.get_guild(payload["guild_id"])
+            member = guild.get_member(user_id) if guild else None
+            if member:
+                guild_members.insert(0, (guild, member))
+                mutation = self.origin_role_mutation(guild, member)
+                if mutation:
+                    mutations.append(mutation)
+
+            for verified_guild, verified_member in guild_members:
+                self.bot.dispatch('member_verified', verified_guild, verified_member, member_id)
+            grants = await self.apply_role_mutations(mutations)
+        except Exception as e:
+            log.error(f"Error granting roles for batch item {index}: {e}", exc_info=True)
+            result.update(status=500, message=f"Server error: {str(e)}")
+            return result
+
+        result.update(
+            status=201,
+            servers=len(guild_members),
+            roles_granted=len(grants.succeeded),
+            roles_failed=len(grants.failed),
+        )
+        return result
 
-                if other_role and other_role not in other_member.roles:
-                    try:
-                        await other_member.add_roles(other_role)
-                    except discord.Forbidden:
-                        log.warning(f"Could not grant verified role to {username} in {other_guild.name} - missing permissions")
+    async def process_verification(self, payload):
+        """Store the member ID and grant the verified role everywhere.
 
-            try:
-                await member.send(
-                    f"Congratulations! You have been verified with member ID: {member_id}. It may take a few minutes for your access to be updated."
-                )
-            except discord.Forbidden:
-                pass  # Can't send DM
+        Returns the HTTP status and response text for the verification.
+        """
+        user_id = payload["user_id"]
+        username = payload["username"]
+        member_id = payload["member_id"]
+
+        # The guild or member may have gone away while a job was queued
+        guild = self.bot.get_guild(payload["guild_id"])
+        if not guild:
+            return 404, "Guild not found"
+
+        member = guild.get_member(user_id)
+        if not member:
+            return 404, "Member not found"
+
+        # Save the member ID for this user
+        await self.store_verified_member(user_id, member_id)
+
+        # Grant the verified role in the originating guild and ALL other servers where this user exists
+        # and verification is enabled, as one fan-out through the role executor
+        other_members, mutations = self.verified_role_mutations(user_id, add=True, exclude_guild_id=guild.id)
+        mutation = self.origin_role_mutation(guild, member)
+        if mutation:
+            mutations.insert(0, mutation)
+        self.bot.dispatch('member_verified', guild, member, member_id)
+        servers_updated = [guild.name]
+        for other_guild, other_member in other_members:
+            servers_updated.append(other_guild.name)
+            # Dispatch verification event for this server too
+            self.bot.dispatch('member_verified', other_guild, other_member, member_id)
+        await self.apply_role_mutations(mutations)
 
-            return web.Response(
-                text=f"Successfully verified {username} (ID: {user_id}) with member ID: {member_id}",
-                status=201,
+        try:
+            await member.send(
+                f"Congratulations! You have been verified with member ID: {member_id}. It may take a few minutes for your access to be updated."
             )
+        except discord.Forbidden:
+            self.metrics.dm_failures.inc()  # Can't send DM
 
-        except jwt.ExpiredSignatureError:
-            return web.Response(text="JWT token has expired", status=401)
-        except jwt.InvalidTokenError:
-            return web.Response(text="Invalid JWT token", status=401)
-        except Exception as e:
-            return web.Response(text=f"Server error: {str(e)}", status=500)
+        return 201, f"Successfully verified {username} (ID: {user_id}) with member ID: {member_id}"
 
-    async def complete_verification(self, guild: discord.Guild, member: discord.Member, member_id: str):
-        # Grant the verified role in the originating guild
-        role_id = await self.config.guild(guild).role_id()
-        role = get(guild.roles, id=role_id) if role_id else None
+    def origin_role_mutation(self, guild: discord.Guild, member: discord.Member):
+        """The verified role grant for the guild a verification came from, regardless of its enabled state."""
+        role_id = self.guild_settings(guild).role_id
+        role = guild.get_role(role_id) if role_id else None
+        if role and role not in member.roles:
+            return RoleMutation(guild, member, role)
+        return None
 
-        if role:
-            await member.add_roles(role)
+    async def complete_verification(self, guild: discord.Guild, member: discord.Member, member_id: str):
+        # Grant the verified role in the originating guild through the role executor
+        mutation = self.origin_role_mutation(guild, member)
+        if mutation:
+            await self.apply_role_mutations([mutation])
 
         self.bot.dispatch('member_verified', guild, member, member_id)
 
@@ -191,7 +749,7 @@ class WebVerifier(commands.Cog):
         self, member: discord.Member, guild: discord.Guild
     ):
         """Generate a JWT token for verification."""
-        secret = await self.config.jwt_secret()
+        secret = self._jwt_secret
         if not secret:
             raise ValueError("JWT secret not configured. Please set a secret using the setsecret command.")
 
@@ -201,6 +759,7 @@ class WebVerifier(commands.Cog):
             "guild_id": str(guild.id),
             "exp": int(time.time()) + 1800,  # 30 minutes expiration
             "iat": int(time.time()),
+            "jti": uuid.uuid4().hex,  # Lets the return endpoint recognise replays
         }
 
         token = jwt.encode(payload, secret, algorithm="HS256")
@@ -215,68 +774,32 @@ class WebVerifier(commands.Cog):
 
     def normalize_answer(self, answer):
         """Normalize the answer by removing spaces and converting to lowercase."""
-        return re.sub(r"[^a-zA-Z0-9]", "", answer).lower()
+        return normalize_answer(answer)
 
     async def log_incorrect_answer(self, user_id: int, guild_id: int, original_answer: str, normalized_answer: str):
-        """Log an incorrect answer with normalized grouping and timestamp."""
+        """Log an incorrect answer with normalized grouping and timestamp.
+
+        The answer is buffered in memory and written to Config in batches.
+        """
         try:
-            async with self.config.incorrect_answers() as incorrect_answers:
-                # Use normalized answer as the key for grouping
-                if normalized_answer not in incorrect_answers:
-                    incorrect_answers[normalized_answer] = {
-                        "count": 0,
-                        "original_forms": [],
-                        "first_seen": int(time.time()),
-                        "last_seen": int(time.time()),
-                        "users": []
-                    }
-
-                entry = incorrect_answers[normalized_answer]
-
-                # Convert to list if stored as set (data migration from older versions)
-                if isinstance(entry.get("original_forms"), set):
-                    entry["original_forms"] = list(entry["original_forms"])
-                if isinstance(entry.get("users"), set):
-                    entry["users"] = list(entry["users"])
-
-                # Work with sets for uniqueness
-                original_forms_set = set(entry.get("original_forms", []))
-                users_set = set(entry.get("users", []))
-
-                entry["count"] += 1
-                original_forms_set.add(original_answer)
-                entry["last_seen"] = int(time.time())
-                users_set.add(f"{user_id}:{guild_id}")
-
-                # Store as lists
-                entry["original_forms"] = list(original_forms_set)
-                entry["users"] = list(users_set)
+            self.incorrect_log.record(user_id, guild_id, original_answer, normalized_answer)
         except Exception as e:
             log.error(f"Error logging incorrect answer: {e}", exc_info=True)
 
     async def get_question_config(self, guild: discord.Guild):
         """Get question config, checking guild first, then global fallback."""
-        # First check guild config (takes precedence)
-        guild_question = await self.config.guild(guild).question()
-        if guild_question and guild_question.get("question"):
-            return guild_question, "guild"
-
-        # Fallback to global config
-        global_question = await self.config.question()
-        if global_question and global_question.get("question"):
-            return global_question, "global"
-
-        # No question set anywhere
-        return None, None
+        settings = self.guild_settings(guild)
+        return settings.question, settings.question_source
 
     async def ask_question_and_generate_url(
         self, member: discord.Member, guild: discord.Guild, channel: discord.TextChannel, skip_question=False
     ):
         """Ask the static question and generate verification URL."""
         prefix = await self.get_prefix(member)
-        config = await self.config.guild(guild).all()
-        question, _ = await self.get_question_config(guild)
-        kick_on_fail = config["kick_on_fail"]
+        settings = self.guild_settings(guild)
+        question = settings.question
+        accepted_answers = settings.answers
+        kick_on_fail = settings.kick_on_fail
         verification_url = await self.config.verification_url()
 
         if not question:
@@ -288,23 +811,18 @@ class WebVerifier(commands.Cog):
                 await channel.send(f"{member.mention}, {self.forbidden_help_message}")
             return
 
-        def check(m):
-            return m.author == member and isinstance(m.channel, discord.DMChannel)
-
         try:
             if not skip_question:
-                await member.send(
-                    "Welcome! Please answer the following question correctly to gain access to the server. You have 90 seconds to answer."
-                )
-                await member.send(f"**{question['question']}**")
-
-                # Wait for the user's answer
-                msg = await self.bot.wait_for("message", check=check, timeout=90.0)
-                normalized_response = self.normalize_answer(msg.content)
-                if not any(
-                    normalized_response == self.normalize_answer(answer)
-                    for answer in question["answers"]
-                ):
+                with self.dm_router.session(member.id) as session:
+                    await member.send(
+                        "Welcome! Please answer the following question correctly to gain access to the server. You have 90 seconds to answer."
+                    )
+                    await member.send(f"**{question['question']}**")
+
+                    # Wait for the user's answer
+                    msg = await session.wait(90.0)
+                normalized_response = normalize_answer(msg.content)
+                if normalized_response not in accepted_answers:
                     # Log the incorrect answer
                     await self.log_incorrect_answer(member.id, guild.id, msg.content, normalized_response)
 
@@ -345,6 +863,7 @@ This link will expire in 30 minutes."""
                     f"{member.mention}, the verification system is not properly configured. Please contact an admin."
                 )
         except discord.Forbidden:
+            self.metrics.dm_failures.inc()
             await channel.send(f"{member.mention}, {self.forbidden_help_message}")
         except Exception as e:
             log.error(f"Error generating verification URL: {e}")
@@ -364,68 +883,79 @@ This link will expire in 30 minutes."""
     @commands.Cog.listener()
     async def on_member_join(self, member: discord.Member):
         """Trigger verification process when a member joins if enabled."""
-        verification_enabled = await self.config.guild(member.guild).verification_enabled()
-        verify_on_join = await self.config.guild(member.guild).verify_on_join()
-        if verification_enabled:
-            verified_members = await self.config.verified_members()
-            if str(member.id) in verified_members:
-                self.bot.dispatch('member_verified', member.guild, member, verified_members[str(member.id)])
+        settings = self.guild_settings(member.guild)
+        if settings.enabled:
+            self.membership_index.add(member.id, member.guild.id)
+            if member.id in self.verified_index:
+                self.bot.dispatch('member_verified', member.guild, member, self.verified_index.get(member.id))
                 return
-            if verify_on_join:
+            if settings.verify_on_join:
                 await self.ask_question_and_generate_url(
                     member, member.guild, member.guild.system_channel
                 )
 
     @commands.Cog.listener()
-    async def on_member_update(self, before: discord.Member, after: discord.Member):
-        """Monitor role changes and remove verified role from unauthorized users."""
-        # Only check if verification is enabled for this guild
-        verification_enabled = await self.config.guild(after.guild).verification_enabled()
-        if not verification_enabled:
-            return
+    async def on_member_remove(self, member: discord.Member):
+        """Drop the member's guild from the membership index."""
+        self.membership_index.discard(member.id, member.guild.id)
 
-        # Get the configured verified role for this guild
-        role_id = await self.config.guild(after.guild).role_id()
-        if not role_id:
-            return
+    @commands.Cog.listener()
+    async def on_guild_join(self, guild: discord.Guild):
+        """Index the members of a newly joined guild if it already has verification enabled."""
+        if self.guild_settings(guild).enabled:
+            self._enabled_guild_ids.add(guild.id)
+            self.membership_index.add_guild(guild.id, (member.id for member in guild.members))
+
+    @commands.Cog.listener()
+    async def on_guild_remove(self, guild: discord.Guild):
+        """Forget a guild the bot has left."""
+        if guild.id in self._enabled_guild_ids:
+            self.membership_index.remove_guild(guild.id)
 
-        verified_role = get(after.guild.roles, id=role_id)
-        if not verified_role:
+    @commands.Cog.listener()
+    async def on_message(self, message: discord.Message):
+        """Hand direct messages to the verification session waiting on their author."""
+        self.dm_router.route(message)
+
+    @commands.Cog.listener()
+    async def on_member_update(self, before: discord.Member, after: discord.Member):
+        """Monitor role changes and remove verified role from unauthorized users.
+
+        This fires for every member change in every guild, so everything up to
+        the rare "verified role was just added" case is synchronous lookups.
+        """
+        # Only check guilds where verification is enabled and a verified role is set
+        role_id = self._verified_role_ids.get(after.guild.id)
+        if role_id is None:
             return
 
         # Check if the verified role was added to this member
-        before_has_role = verified_role in before.roles
-        after_has_role = verified_role in after.roles
-
-        if not before_has_role and after_has_role:
-            # Verified role was just added - check if user is authorized
-            verified_members = await self.config.verified_members()
+        verified_role = after.get_role(role_id)
+        if verified_role is None or before.get_role(role_id) is not None:
+            return
 
-            if str(after.id) not in verified_members:
-                # User is not in verified members list - remove the role
-                try:
-                    await after.remove_roles(verified_role, reason="User not in verified members list")
-                    log.warning(f"Removed verified role from unauthorized user {after.display_name} ({after.id}) in {after.guild.name}")
-                except discord.Forbidden:
-                    log.error(f"Missing permissions to remove verified role from {after.display_name} in {after.guild.name}")
-                except discord.HTTPException as e:
-                    log.error(f"Failed to remove verified role from {after.display_name} in {after.guild.name}: {e}")
+        # Verified role was just added - check if user is authorized
+        if after.id not in self.verified_index:
+            # User is not in verified members list - remove the role (failures are logged by the executor)
+            result = await self.apply_role_mutations(
+                [RoleMutation(after.guild, after, verified_role, False, "User not in verified members list")]
+            )
+            if result.succeeded:
+                log.warning(f"Removed verified role from unauthorized user {after.display_name} ({after.id}) in {after.guild.name}")
 
     @commands.guild_only()
     @commands.command()
     async def verify(self, ctx: commands.Context):
         """Manually trigger the verification process."""
-        verification_enabled = await self.config.guild(ctx.guild).verification_enabled()
-        if not verification_enabled:
+        if not self.guild_settings(ctx.guild).enabled:
             await ctx.send("Verification is currently disabled.")
             return
 
         member = ctx.author
-        verified_members = await self.config.verified_members()
 
         # Check if user is already globally verified
-        if str(member.id) in verified_members:
-            stored_member_id = verified_members[str(member.id)]
+        if member.id in self.verified_index:
+            stored_member_id = self.verified_index.get(member.id)
 
             # If stored_member_id is numeric and above the temp_member_seed, skip the question
             temp_seed = await self.config.temp_member_seed()
@@ -447,16 +977,11 @@ This link will expire in 30 minutes."""
     async def unverify(self, ctx: commands.Context):
         """Warn user they will be kicked, confirm with reactions, then kick and unverify. This is intended for is a user is no longer using a discord account."""
         member = ctx.author
-        verified_members = await self.config.verified_members()
-        if str(member.id) not in verified_members:
+        if member.id not in self.verified_index:
             await ctx.send("You are not verified.")
             return
 
-        total_guilds = 0
-        for guild in self.bot.guilds:
-            guild_member = guild.get_member(member.id)
-            if guild_member:
-                total_guilds += 1
+        total_guilds = sum(1 for _ in self.member_guilds(member.id))
 
         # Warn and ask for confirmation
         confirm_msg = await ctx.send(
@@ -481,35 +1006,18 @@ This link will expire in 30 minutes."""
             return
 
         # Remove role from ALL servers and kick from current server
-        servers_processed = []
         kicked_from = []
         not_kicked_from = []
 
         # Remove from global verified members first
-        async with self.config.verified_members() as global_verified:
-            if str(member.id) in global_verified:
-                del global_verified[str(member.id)]
+        await self.remove_verified_member(member.id)
 
         # Remove verified role from all servers where user exists
-        for guild in self.bot.guilds:
-            guild_member = guild.get_member(member.id)
-            if not guild_member:
-                continue
-
-            verification_enabled = await self.config.guild(guild).verification_enabled()
-            if not verification_enabled:
-                continue
-
-            role_id = await self.config.guild(guild).role_id()
-            role = get(guild.roles, id=role_id) if role_id else None
-
-            if role and role in guild_member.roles:
-                try:
-                    await guild_member.remove_roles(role)
-                    servers_processed.append(guild.name)
-                except discord.Forbidden:
-                    pass  # Ignore permission errors
+        guild_members, mutations = self.verified_role_mutations(member.id, add=False)
+        result = await self.apply_role_mutations(mutations)
+        servers_processed = [done.mutation.guild.name for done in result.succeeded]
 
+        for guild, guild_member in guild_members:
             try:
                 await guild_member.kick(reason="User requested verification removal.")
                 kicked_from.append(guild.name)
@@ -538,12 +1046,13 @@ This link will expire in 30 minutes."""
     async def verifiedrole(self, ctx: commands.Context, role: discord.Role):
         """Set the role to be granted upon verification."""
         await self.config.guild(ctx.guild).role_id.set(role.id)
+        await self.invalidate_guild_settings(ctx.guild)
         await ctx.send(f"The verified role has been set to {role.name}.")
 
     @verifyset.command()
     async def clearverifiedrole(self, ctx: commands.Context):
         """Clear the verified role setting for this guild."""
-        current_role_id = await self.config.guild(ctx.guild).role_id()
+        current_role_id = self.guild_settings(ctx.guild).role_id
 
         if not current_role_id:
             await ctx.send("No verified role is currently set for this guild.")
@@ -554,6 +1063,7 @@ This link will expire in 30 minutes."""
         role_name = current_role.name if current_role else f"Role ID {current_role_id}"
 
         await self.config.guild(ctx.guild).role_id.set(None)
+        await self.invalidate_guild_settings(ctx.guild)
         await ctx.send(f"The verified role ({role_name}) has been cleared. No role will be granted upon verification until a new one is set.")
 
     @verifyset.command()
@@ -561,6 +1071,7 @@ This link will expire in 30 minutes."""
         """Set the verification question for this guild (overrides global question)."""
         question_data = {"question": question_text, "answers": list(answers)}
         await self.config.guild(ctx.guild).question.set(question_data)
+        await self.invalidate_guild_settings(ctx.guild)
         await ctx.send("Guild question added. This will override any global question for this server.")
 
     @verifyset.command()
@@ -584,21 +1095,24 @@ This link will expire in 30 minutes."""
         existing_answers = guild_question.get("answers", [])
         new_answers = list(answers)
 
-        # Check for duplicates (case-insensitive)
-        normalized_existing = [self.normalize_answer(ans) for ans in existing_answers]
+        # Check for duplicates (case-insensitive) against the compiled answers
+        normalized_existing = set(self.guild_settings(ctx.guild).answers)
         duplicates = []
         added = []
 
         for ans in new_answers:
-            if self.normalize_answer(ans) in normalized_existing:
+            normalized = normalize_answer(ans)
+            if normalized in normalized_existing:
                 duplicates.append(ans)
             else:
                 existing_answers.append(ans)
                 added.append(ans)
+                normalized_existing.add(normalized)
 
         # Update the question with new answers
         guild_question["answers"] = existing_answers
         await self.config.guild(ctx.guild).question.set(guild_question)
+        await self.invalidate_guild_settings(ctx.guild)
 
         # Build response message
         response = []
@@ -627,18 +1141,19 @@ This link will expire in 30 minutes."""
 
         # Clear the guild question
         await self.config.guild(ctx.guild).question.set({})
+        await self.invalidate_guild_settings(ctx.guild)
         await ctx.send("✅ Guild question cleared. This server will now use the global question as fallback.")
 
     @verifyset.command()
     async def status(self, ctx: commands.Context):
         """View current verification settings."""
-        config = await self.config.guild(ctx.guild).all()
+        settings = self.guild_settings(ctx.guild)
 
-        role = get(ctx.guild.roles, id=config["role_id"]) if config["role_id"] else None
+        role = get(ctx.guild.roles, id=settings.role_id) if settings.role_id else None
         role_name = role.name if role else "Not set"
 
         # Get current question with source
-        question, question_source = await self.get_question_config(ctx.guild)
+        question, question_source = settings.question, settings.question_source
         if question:
             source_text = "🌐 Global" if question_source == "global" else f"🏠 Guild ({ctx.guild.name})"
             question_text = f"{question['question']} ({source_text})"
@@ -646,22 +1161,21 @@ This link will expire in 30 minutes."""
             question_text = "Not set"
 
         embed = discord.Embed(title="Verification Settings", color=0x00ff00)
-        embed.add_field(name="Enabled", value=config["verification_enabled"], inline=True)
+        embed.add_field(name="Enabled", value=settings.enabled, inline=True)
         embed.add_field(name="Verified Role", value=role_name, inline=True)
-        embed.add_field(name="Kick on Fail", value=config["kick_on_fail"], inline=True)
-        embed.add_field(name="Verify on Join", value=config["verify_on_join"], inline=True)
+        embed.add_field(name="Kick on Fail", value=settings.kick_on_fail, inline=True)
+        embed.add_field(name="Verify on Join", value=settings.verify_on_join, inline=True)
 
         verification_url = await self.config.verification_url()
         embed.add_field(name="Verification URL", value=verification_url or "Not set", inline=False)
         embed.add_field(name="Question", value=question_text, inline=False)
 
         # Enhanced JWT secret status
-        jwt_secret = await self.config.jwt_secret()
+        jwt_secret = self._jwt_secret
         secret_status = "✅ Configured" if jwt_secret and len(jwt_secret) >= 32 else "❌ Not set or too short"
         embed.add_field(name="JWT Secret", value=secret_status, inline=True)
 
-        global_verified_members = await self.config.verified_members()
-        verified_count = len(global_verified_members)
+        verified_count = len(self.verified_index)
         embed.add_field(name="Verified Members", value=verified_count, inline=True)
 
         # Add warnings for incomplete configuration
@@ -670,7 +1184,7 @@ This link will expire in 30 minutes."""
             warnings.append("⚠️ JWT secret not configured or too short")
         if not question:
             warnings.append("⚠️ Verification question not set (neither global nor guild-specific)")
-        if not config["role_id"]:
+        if not settings.role_id:
             warnings.append("⚠️ Verified role not set")
         if not verification_url:
             warnings.append("⚠️ Verification URL not set")
@@ -696,6 +1210,7 @@ This link will expire in 30 minutes."""
     async def setkickonfail(self, ctx: commands.Context, kick_on_fail: bool):
         """Enable or disable kicking the user on verification failure."""
         await self.config.guild(ctx.guild).kick_on_fail.set(kick_on_fail)
+        await self.invalidate_guild_settings(ctx.guild)
         status = "enabled" if kick_on_fail else "disabled"
         await ctx.send(f"Kicking on verification failure has been {status}.")
 
@@ -703,6 +1218,7 @@ This link will expire in 30 minutes."""
     async def verifyonjoin(self, ctx: commands.Context, verify_on_join: bool):
         """Enable or disable auto-start of verification on join."""
         await self.config.guild(ctx.guild).verify_on_join.set(verify_on_join)
+        await self.invalidate_guild_settings(ctx.guild)
         status = "enabled" if verify_on_join else "disabled"
         await ctx.send(f"Verification on join has been {status}.")
 
@@ -710,69 +1226,80 @@ This link will expire in 30 minutes."""
     async def enabled(self, ctx: commands.Context, verification_enabled: bool):
         """Enable or disable the verification process."""
         await self.config.guild(ctx.guild).verification_enabled.set(verification_enabled)
+        await self.invalidate_guild_settings(ctx.guild)
         status = "enabled" if verification_enabled else "disabled"
 
         # If enabling verification, check for already verified members and grant roles
         if verification_enabled:
-            role_id = await self.config.guild(ctx.guild).role_id()
+            role_id = self.guild_settings(ctx.guild).role_id
             if role_id:
                 role = get(ctx.guild.roles, id=role_id)
                 if role:
-                    verified_members = await self.config.verified_members()
-                    granted_count = 0
-
-                    for member in ctx.guild.members:
-                        user_id = str(member.id)
-                        if user_id in verified_members and role not in member.roles:
-                            try:
-                                await member.add_roles(role)
-                                # Dispatch verification event for already verified members
-                                self.bot.dispatch('member_verified', ctx.guild, member, verified_members[user_id])
-                                granted_count += 1
-                            except discord.Forbidden:
-                                log.warning(f"Could not grant verified role to {member.display_name} in {ctx.guild.name} - missing permissions")
-
-                    if granted_count > 0:
-                        await ctx.send(f"Verification has been {status}. Granted verified role to {granted_count} already verified member(s).")
-                    else:
-                        await ctx.send(f"Verification has been {status}.")
+                    running = self._backfills.get(ctx.guild.id)
+                    if running and running.running:
+                        await ctx.send(f"Verification has been {status}. A verified role backfill is already running: {running.describe()}")
+                        return
+
+                    progress_msg = await ctx.send(
+                        f"Verification has been {status}. Granting verified role to already verified members in the background..."
+                    )
+                    state = new_backfill_state(ctx.channel.id, progress_msg.id)
+                    await self.config.guild(ctx.guild).backfill.set(state)
+                    self.start_backfill(ctx.guild, state)
                 else:
                     await ctx.send(f"Verification has been {status}. Warning: The configured verified role was not found.")
             else:
                 await ctx.send(f"Verification has been {status}.")
         else:
+            backfill = self._backfills.get(ctx.guild.id)
+            if backfill:
+                await backfill.stop()
+                await self.finish_backfill(ctx.guild)
             await ctx.send(f"Verification has been {status}.")
 
+    @verifyset.group()
+    async def backfill(self, ctx: commands.Context):
+        """Manage the background grant of the verified role to already verified members."""
+        return
+
+    @backfill.command(name="status")
+    async def backfill_status(self, ctx: commands.Context):
+        """Show the progress of the verified role backfill in this server."""
+        backfill = self._backfills.get(ctx.guild.id)
+        if backfill is None:
+            await ctx.send("No verified role backfill is running in this server.")
+            return
+        state = "running" if backfill.running else "stopped (will resume when the cog reloads)"
+        await ctx.send(f"Verified role backfill is {state}. {backfill.describe()}")
+
+    @backfill.command(name="cancel")
+    async def backfill_cancel(self, ctx: commands.Context):
+        """Cancel the verified role backfill in this server."""
+        backfill = self._backfills.get(ctx.guild.id)
+        if backfill is None:
+            await ctx.send("No verified role backfill is running in this server.")
+            return
+        await backfill.stop()
+        await self.finish_backfill(ctx.guild)
+        await ctx.send(f"Verified role backfill cancelled. {backfill.describe()}")
+
     @verifyset.command(name="checkuser")
     async def verifyset_checkuser(self, ctx: commands.Context, user: discord.Member):
         """Check if a user is globally verified and show their member ID."""
-        verified_members = await self.config.verified_members()
-        user_id = str(user.id)
-
-        if user_id in verified_members:
+        if user.id in self.verified_index:
             if ctx.guild.get_member(user.id) is None:
                 await ctx.send(f"{user.display_name} is not a member of this server.")
                 return
 
-            member_id = verified_members[user_id]
-            role_id = await self.config.guild(ctx.guild).role_id()
+            member_id = self.verified_index.get(user.id)
+            role_id = self.guild_settings(ctx.guild).role_id
 
             if role_id:
                 role = get(ctx.guild.roles, id=role_id)
                 has_role = role in user.roles if role else False
 
             # Check how many servers this user has verified role in
-            verified_servers = []
-            for guild in self.bot.guilds:
-                guild_member = guild.get_member(user.id)
-                if not guild_member:
-                    continue
-
-                verification_enabled = await self.config.guild(guild).verification_enabled()
-                if not verification_enabled:
-                    continue
-
-                verified_servers.append(guild.name)
+            verified_servers = [guild.name for guild, _ in self.member_guilds(user.id)]
 
             embed = discord.Embed(title="User Verification Status", color=0x00ff00)
             embed.add_field(name="User", value=user.mention, inline=True)
@@ -797,6 +1324,7 @@ This link will expire in 30 minutes."""
         """Set the global verification question (fallback when no guild question is set)."""
         question_data = {"question": question_text, "answers": list(answers)}
         await self.config.question.set(question_data)
+        await self.invalidate_global_question()
         await ctx.send("Global question added. This will be used as fallback for guilds that don't have their own question set.")
 
     @verifyconfig.command("addanswers")
@@ -820,21 +1348,24 @@ This link will expire in 30 minutes."""
         existing_answers = global_question.get("answers", [])
         new_answers = list(answers)
 
-        # Check for duplicates (case-insensitive)
-        normalized_existing = [self.normalize_answer(ans) for ans in existing_answers]
+        # Check for duplicates (case-insensitive) against the compiled answers
+        normalized_existing = set(self._global_answers)
         duplicates = []
         added = []
 
         for ans in new_answers:
-            if self.normalize_answer(ans) in normalized_existing:
+            normalized = normalize_answer(ans)
+            if normalized in normalized_existing:
                 duplicates.append(ans)
             else:
                 existing_answers.append(ans)
                 added.append(ans)
+                normalized_existing.add(normalized)
 
         # Update the question with new answers
         global_question["answers"] = existing_answers
         await self.config.question.set(global_question)
+        await self.invalidate_global_question()
 
         # Build response message
         response = []
@@ -850,6 +1381,7 @@ This link will expire in 30 minutes."""
     async def clearglobalquestion(self, ctx: commands.Context):
         """Clear the global verification question."""
         await self.config.question.set({})
+        await self.invalidate_global_question()
         await ctx.send("Global question cleared. Guilds without their own questions will have no verification question set.")
 
     @verifyconfig.command("showquestion")
@@ -866,65 +1398,31 @@ This link will expire in 30 minutes."""
     @verifyconfig.command()
     async def addmember(self, ctx: commands.Context, user: discord.Member, member_id: str):
         """Manually add a member's ID and verify them."""
-        async with self.config.verified_members() as verified_members:
-            verified_members[str(user.id)] = member_id
+        await self.store_verified_member(user.id, member_id)
 
         # Grant the verified role in ALL servers where this user exists and verification is enabled
-        for guild in self.bot.guilds:
-            guild_member = guild.get_member(user.id)
-            if not guild_member:
-                continue
-
-            verification_enabled = await self.config.guild(guild).verification_enabled()
-            if not verification_enabled:
-                continue
-
-            role_id = await self.config.guild(guild).role_id()
-            role = get(guild.roles, id=role_id) if role_id else None
-
+        guild_members, mutations = self.verified_role_mutations(user.id, add=True)
+        for guild, guild_member in guild_members:
+            # Dispatch verification event for each server
             self.bot.dispatch('member_verified', guild, guild_member, member_id)
-
-            if role and role not in guild_member.roles:
-                try:
-                    await guild_member.add_roles(role)
-                    # Dispatch verification event for each server
-                except discord.Forbidden:
-                    pass  # Ignore permission errors
+        await self.apply_role_mutations(mutations)
 
         await ctx.send(f"{user.name} has been manually verified with member ID: {member_id}.")
 
     @verifyconfig.command()
     async def removemember(self, ctx: commands.Context, user: discord.User):
         """Remove a member's global verification record and roles from all servers."""
-        verified_members = await self.config.verified_members()
-        if str(user.id) not in verified_members:
+        if user.id not in self.verified_index:
             await ctx.send(f"{user.display_name} is not in the global verified members list.")
             return
 
         # Remove from global verified members
-        async with self.config.verified_members() as global_verified:
-            del global_verified[str(user.id)]
+        await self.remove_verified_member(user.id)
 
         # Remove verified role from all servers where user exists
-        servers_processed = []
-        for guild in self.bot.guilds:
-            guild_member = guild.get_member(user.id)
-            if not guild_member:
-                continue
-
-            verification_enabled = await self.config.guild(guild).verification_enabled()
-            if not verification_enabled:
-                continue
-
-            role_id = await self.config.guild(guild).role_id()
-            role = get(guild.roles, id=role_id) if role_id else None
-
-            if role and role in guild_member.roles:
-                try:
-                    await guild_member.remove_roles(role)
-                    servers_processed.append(guild.name)
-                except discord.Forbidden:
-                    pass  # Ignore permission errors
+        _, mutations = self.verified_role_mutations(user.id, add=False)
+        result = await self.apply_role_mutations(mutations)
+        servers_processed = [done.mutation.guild.name for done in result.succeeded]
 
         status_msg = f"Removed verification record for {user.display_name}"
         if servers_processed:
@@ -935,29 +1433,16 @@ This link will expire in 30 minutes."""
     @verifyconfig.command(name="checkuser")
     async def verifyconfig_checkuser(self, ctx: commands.Context, user: discord.Member):
         """Check if a user is globally verified and show their member ID."""
-        verified_members = await self.config.verified_members()
-        user_id = str(user.id)
-
-        if user_id in verified_members:
-            member_id = verified_members[user_id]
-            role_id = await self.config.guild(ctx.guild).role_id()
+        if user.id in self.verified_index:
+            member_id = self.verified_index.get(user.id)
+            role_id = self.guild_settings(ctx.guild).role_id
 
             if role_id:
                 role = get(ctx.guild.roles, id=role_id)
                 has_role = role in user.roles if role else False
 
             # Check how many servers this user has verified role in
-            verified_servers = []
-            for guild in self.bot.guilds:
-                guild_member = guild.get_member(user.id)
-                if not guild_member:
-                    continue
-
-                verification_enabled = await self.config.guild(guild).verification_enabled()
-                if not verification_enabled:
-                    continue
-
-                verified_servers.append(guild.name)
+            verified_servers = [guild.name for guild, _ in self.member_guilds(user.id)]
 
             embed = discord.Embed(title="User Verification Status", color=0x00ff00)
             embed.add_field(name="User", value=user.mention, inline=True)
@@ -971,40 +1456,281 @@ This link will expire in 30 minutes."""
         else:
             await ctx.send(f"{user.display_name} is not verified.")
 
+    def verified_member_name(self, user_id: int, guild: discord.Guild = None):
+        """Resolve a verified user's display name from the member caches, or None if unknown."""
+        member = guild.get_member(user_id) if guild else None
+        if member is None:
+            member = next((guild_member for _, guild_member in self.member_guilds(user_id)), None)
+        if member is None:
+            member = self.bot.get_user(user_id)
+        return member.display_name if member else None
+
+    def filter_verified_members(self, guild: discord.Guild = None, user_prefix: str = "", member_prefix: str = ""):
+        """Return matching ``(user_id, member_id)`` pairs from the index, sorted by user ID."""
+        matches = []
+        for user_id, member_id in self.verified_index.items():
+            if guild is not None and guild.get_member(user_id) is None:
+                continue
+            if user_prefix and not str(user_id).startswith(user_prefix):
+                continue
+            if member_prefix and not str(member_id).startswith(member_prefix):
+                continue
+            matches.append((user_id, member_id))
+        matches.sort()
+        return matches
+
+    async def write_verified_members_file(self, matches, file_format: str, guild: discord.Guild = None):
+        """Write matches row by row to a temporary file and return it rewound."""
+        export = tempfile.TemporaryFile()
+        text = io.TextIOWrapper(export, encoding="utf-8", newline="")
+        writer = csv.writer(text) if file_format == "csv" else None
+        if writer:
+            writer.writerow(["user_id", "member_id", "name"])
+        for count, (user_id, member_id) in enumerate(matches, 1):
+            name = self.verified_member_name(user_id, guild)
+            if writer:
+                writer.writerow([user_id, member_id, name or ""])
+            else:
+                text.write(json.dumps({"user_id": str(user_id), "member_id": member_id, "name": name}) + "\n")
+            if count % 1000 == 0:
+                await asyncio.sleep(0)  # Let the bot handle events during large exports
+        text.flush()
+        text.detach()
+        export.seek(0)
+        return export
+
+    async def send_verified_members_file(self, ctx: commands.Context, matches, file_format: str, guild: discord.Guild = None):
+        """Export matches to a file and upload it, unless it exceeds the upload limit."""
+        async with ctx.typing():
+            export = await self.write_verified_members_file(matches, file_format, guild or ctx.guild)
+        with export:
+            size = export.seek(0, io.SEEK_END)
+            export.seek(0)
+            # Direct messages use Discord's default 8 MiB limit
+            if size > (ctx.guild.filesize_limit if ctx.guild else 8 * 1024 * 1024):
+                await ctx.send(
+                    f"❌ The export is {size // 1024} KiB, over this server's upload limit. Narrow it down with filters."
+                )
+                return
+            await ctx.send(
+                f"✅ Exported {len(matches)} verified member(s).",
+                file=discord.File(export, filename=f"verified_members.{file_format}"),
+            )
+
     @verifyconfig.command()
-    async def viewmembers(self, ctx: commands.Context):
-        """View all verified members and their member IDs."""
-        verified_members = await self.config.verified_members()
-        if not verified_members:
+    async def viewmembers(self, ctx: commands.Context, page: Optional[int] = 1, *, filters: str = ""):
+        """View verified members and their member IDs, a page at a time.
+
+        Filters are `key:value` pairs after the page number:
+        - `guild:<id>` or `guild:here` only shows members of that server
+        - `user:<prefix>` only shows Discord user IDs starting with the prefix
+        - `member:<prefix>` only shows member IDs starting with the prefix
+        - `--file` sends every match as a CSV attachment instead (`--file=jsonl` for JSON lines)
+
+        Args:
+            page: Page to show (default: 1)
+            filters: Optional `guild:`, `user:`, `member:` and `--file` options
+        """
+        guild = None
+        user_prefix = ""
+        member_prefix = ""
+        file_format = None
+        for token in filters.split():
+            key, _, value = token.partition(":")
+            if token == "--file" or token.startswith("--file="):
+                file_format = token.partition("=")[2] or "csv"
+                if file_format not in ("csv", "jsonl"):
+                    await ctx.send("❌ File format must be `csv` or `jsonl`.")
+                    return
+            elif key == "guild" and value == "here" and ctx.guild:
+                guild = ctx.guild
+            elif key == "guild" and value.isdigit():
+                guild = self.bot.get_guild(int(value))
+                if guild is None:
+                    await ctx.send(f"❌ I am not in a server with ID {value}.")
+                    return
+            elif key == "user" and value.isdigit():
+                user_prefix = value
+            elif key == "member" and value:
+                member_prefix = value
+            else:
+                await ctx.send(
+                    f"❌ Invalid filter `{token}`. Use `guild:<id|here>`, `user:<prefix>`, `member:<prefix>` or `--file`."
+                )
+                return
+
+        if not self.verified_index:
             await ctx.send("No verified members found.")
             return
 
-        member_list = []
-        for user_id, member_id in verified_members.items():
-            # Try to find the member in the current guild first, then any guild
-            member = ctx.guild.get_member(int(user_id))
-            if not member:
-                # Look for the member in other guilds
-                for guild in self.bot.guilds:
-                    member = guild.get_member(int(user_id))
-                    if member:
-                        break
+        matches = self.filter_verified_members(guild, user_prefix, member_prefix)
+        if not matches:
+            await ctx.send("No verified members match those filters.")
+            return
 
-            if member:
-                member_list.append(
-                    f"{member.display_name} ({member.id}): Member ID {member_id}"
+        if file_format:
+            await self.send_verified_members_file(ctx, matches, file_format, guild)
+            return
+
+        pages = max(1, -(-len(matches) // VIEWMEMBERS_PAGE_SIZE))
+        page = min(max(page, 1), pages)
+        start = (page - 1) * VIEWMEMBERS_PAGE_SIZE
+        lines = []
+        for user_id, member_id in matches[start:start + VIEWMEMBERS_PAGE_SIZE]:
+            name = self.verified_member_name(user_id, guild or ctx.guild) or "Unknown User"
+            lines.append(f"{discord.utils.escape_markdown(name)} ({user_id}): Member ID `{member_id}`")
+
+        embed = discord.Embed(
+            title=f"Verified Members ({len(matches)} total)",
+            description="\n".join(lines),
+            color=0x00ff00,
+        )
+        if filters.strip():
+            embed.add_field(name="Filters", value=" ".join(f"`{token}`" for token in filters.split()), inline=False)
+        footer = f"Page {page}/{pages}"
+        if page < pages:
+            footer += f" • Next: viewmembers {page + 1} {filters}".rstrip()
+        embed.set_footer(text=footer)
+        await ctx.send(embed=embed)
+
+    def parse_import_row(self, line: str, file_format: str, columns):
+        """Parse one import line into ``(user_id, member_id)``, or raise ValueError."""
+        if file_format == "jsonl":
+            row = json.loads(line)
+            if not isinstance(row, dict):
+                raise ValueError("not a JSON object")
+            user_id, member_id = row.get("user_id"), row.get("member_id")
+        else:
+            row = next(csv.reader([line]))
+            if len(row) <= max(columns):
+                raise ValueError("missing columns")
+            user_id, member_id = row[columns[0]], row[columns[1]]
+
+        user_id = str(user_id).strip()
+        if not user_id.isdigit() or not 17 <= len(user_id) <= 20:
+            raise ValueError(f"invalid user ID {user_id!r}")
+        if isinstance(member_id, (int, float)) and not isinstance(member_id, bool):
+            member_id = str(member_id)
+        if not isinstance(member_id, str) or not member_id.strip():
+            raise ValueError("missing member ID")
+        return int(user_id), member_id.strip()
+
+    @verifyconfig.command(name="import")
+    async def import_members(self, ctx: commands.Context, grant_roles: bool = False):
+        """Import verified members from an attached CSV or JSON lines file.
+
+        CSV files need `user_id` and `member_id` columns (a header row is
+        optional); JSON lines files need one `{"user_id": ..., "member_id": ...}`
+        object per line. Both formats match `[p]verifyconfig export`. Rows are
+        written in batches, and a later row for the same user wins.
+
+        Args:
+            grant_roles: Start a verified role backfill in every enabled server afterwards (default: false)
+        """
+        if not ctx.message.attachments:
+            await ctx.send("❌ Attach a `.csv` or `.jsonl` file to import.")
+            return
+        attachment = ctx.message.attachments[0]
+        file_format = "jsonl" if attachment.filename.lower().endswith((".jsonl", ".ndjson", ".json")) else "csv"
+
+        added = updated = unchanged = 0
+        invalid = []  # (line number, reason)
+        batch = {}
+        columns = (0, 1)
+        line_number = 0
+
+        async def flush():
+            nonlocal added, updated, unchanged
+            changes = {}
+            for user_id, member_id in batch.items():
+                existing = self.verified_index.get(user_id)
+                if existing is None:
+                    added += 1
+                elif str(existing) == member_id:
+                    unchanged += 1
+                    continue
+                else:
+                    updated += 1
+                changes[user_id] = member_id
+            batch.clear()
+            if changes:
+                await self.store_verified_members(changes)
+
+        async with ctx.typing():
+            try:
+                async with aiohttp.ClientSession() as session:
+                    async with session.get(attachment.url) as response:
+                        response.raise_for_status()
+                        async for raw in response.content:
+                            line_number += 1
+                            line = raw.decode("utf-8-sig" if line_number == 1 else "utf-8", errors="replace").strip()
+                            if not line:
+                                continue
+                            if line_number == 1 and file_format == "csv" and not next(csv.reader([line]))[0].strip().isdigit():
+                                header = [name.strip().lower() for name in next(csv.reader([line]))]
+                                if "user_id" not in header or "member_id" not in header:
+                                    await ctx.send("❌ The CSV header must contain `user_id` and `member_id` columns.")
+                                    return
+                                columns = (header.index("user_id"), header.index("member_id"))
+                                continue
+                            try:
+                                user_id, member_id = self.parse_import_row(line, file_format, columns)
+                            except ValueError as e:
+                                invalid.append((line_number, str(e)))
+                                continue
+                            batch[user_id] = member_id
+                            if len(batch) >= IMPORT_BATCH_SIZE:
+                                await flush()
+            except (aiohttp.ClientError, ValueError) as e:
+                # ValueError here means a line longer than the stream reader allows
+                await flush()
+                await ctx.send(
+                    f"❌ Import stopped at line {line_number}: {e}. "
+                    f"Rows before it were saved ({added} added, {updated} updated)."
                 )
-            else:
-                member_list.append(f"Unknown User ({user_id}): Member ID {member_id}")
-
-        if member_list:
-            message = f"Verified Members ({len(member_list)} total):\n" + "\n".join(member_list)
-            # Split long messages
-            if len(message) > 2000:
-                for i in range(0, len(message), 1900):
-                    await ctx.send(message[i : i + 1900])
-            else:
-                await ctx.send(message)
+                return
+            await flush()
+
+        report = (
+            f"✅ Import complete: {added} added, {updated} updated, {unchanged} unchanged, {len(invalid)} invalid."
+        )
+        if invalid:
+            shown = "\n".join(f"Line {number}: {reason}" for number, reason in invalid[:10])
+            report += f"\nFirst invalid rows:\n{shown}"
+            if len(invalid) > 10:
+                report += f"\n...and {len(invalid) - 10} more."
+
+        if grant_roles and (added or updated):
+            started = 0
+            for guild in self.enabled_guilds():
+                running = self._backfills.get(guild.id)
+                if (running and running.running) or not self.guild_settings(guild).role_id:
+                    continue
+                state = new_backfill_state(None, None)
+                await self.config.guild(guild).backfill.set(state)
+                self.start_backfill(guild, state)
+                started += 1
+            report += f"\nStarted a verified role backfill in {started} server(s); check progress with `verifyset backfill status` in each server."
+
+        await ctx.send(report)
+
+    @verifyconfig.command()
+    async def export(self, ctx: commands.Context, file_format: str = "csv"):
+        """Export every verified member as a CSV or JSON lines attachment.
+
+        The file can be loaded again with `[p]verifyconfig import`.
+
+        Args:
+            file_format: `csv` or `jsonl` (default: csv)
+        """
+        file_format = file_format.lower()
+        if file_format not in ("csv", "jsonl"):
+            await ctx.send("❌ File format must be `csv` or `jsonl`.")
+            return
+        if not self.verified_index:
+            await ctx.send("No verified members found.")
+            return
+        await self.send_verified_members_file(ctx, sorted(self.verified_index.items()), file_format)
 
     @verifyconfig.command()
     async def setsecret(self, ctx: commands.Context, *, secret: str):
@@ -1018,6 +1744,8 @@ This link will expire in 30 minutes."""
             return
 
         await self.config.jwt_secret.set(secret)
+        self._jwt_secret = secret
+        self.replay_cache.clear()
         await ctx.send(
             "✅ JWT secret has been set successfully. All existing verification tokens are now invalid."
         )
@@ -1050,6 +1778,117 @@ This link will expire in 30 minutes."""
         await self.config.temp_member_seed.set(seed)
         await ctx.send(f"✅ `temp_member_seed` set to {seed}.")
 
+    @verifyconfig.command()
+    async def metricstoken(self, ctx: commands.Context, token: str = None):
+        """Set the bearer token required by the `/metrics` endpoint.
+
+        Run without a token to make the endpoint public again.
+        """
+        await self.config.metrics_token.set(token)
+        self._metrics_token = token
+        try:
+            await ctx.message.delete()
+        except discord.HTTPException:
+            pass  # Can't delete the message holding the token
+        if token:
+            await ctx.send("✅ The metrics endpoint now requires a bearer token.")
+        else:
+            await ctx.send("The metrics endpoint no longer requires a bearer token.")
+
+    @verifyconfig.command()
+    async def asyncmode(self, ctx: commands.Context, enabled: bool):
+        """Enable or disable asynchronous processing of verification callbacks.
+
+        When enabled, `/discord-auth/return` validates the token, queues the
+        verification and answers 202 with a job ID that can be polled at
+        `/discord-auth/status/<job_id>`.
+        """
+        await self.config.async_verification.set(enabled)
+        self._async_verification = enabled
+        status = "enabled" if enabled else "disabled"
+        await ctx.send(f"Asynchronous verification processing has been {status}.")
+
+    @verifyconfig.group(invoke_without_command=True)
+    async def limits(self, ctx: commands.Context):
+        """Show the web server's overload limits.
+
+        Requests over a limit are answered with 429 and a `Retry-After`
+        header before their body is parsed. Changes apply immediately.
+        """
+        embed = discord.Embed(title="Web Server Limits", color=0x00ff00)
+        embed.add_field(name="Max Body Size", value=f"{self._max_body_size} bytes", inline=True)
+        embed.add_field(name="Max In-Flight Verifications", value=self._max_in_flight, inline=True)
+        embed.add_field(name="Verifications In Flight", value=self._verifications_in_flight, inline=True)
+        embed.add_field(name="Per-IP Limit", value=f"{self.ip_buckets.per_minute}/min" if self.ip_buckets.per_minute else "Disabled", inline=True)
+        embed.add_field(name="Per-User Limit", value=f"{self.user_buckets.per_minute}/min" if self.user_buckets.per_minute else "Disabled", inline=True)
+        embed.add_field(
+            name="Trust X-Forwarded-For",
+            value=f"Yes, {self._forwarded_for_hops} proxy hop(s)" if self._trust_forwarded_for else "No",
+            inline=True,
+        )
+        embed.add_field(name="Armed Answer Deadlines", value=len(self.dm_router.deadlines), inline=True)
+        await ctx.send(embed=embed)
+
+    @limits.command(name="bodysize")
+    async def limits_bodysize(self, ctx: commands.Context, max_bytes: int):
+        """Set the largest body accepted by `/discord-auth/return`, in bytes."""
+        if max_bytes < 1024:
+            await ctx.send("❌ The body size limit must be at least 1024 bytes.")
+            return
+        await self.config.max_body_size.set(max_bytes)
+        self._max_body_size = max_bytes
+        await ctx.send(f"✅ Verification requests are now limited to {max_bytes} bytes.")
+
+    @limits.command(name="inflight")
+    async def limits_inflight(self, ctx: commands.Context, max_requests: int):
+        """Set how many verification requests are handled at once before shedding."""
+        if max_requests < 1:
+            await ctx.send("❌ The in-flight limit must be at least 1.")
+            return
+        await self.config.max_in_flight.set(max_requests)
+        self._max_in_flight = max_requests
+        await ctx.send(f"✅ Up to {max_requests} verification request(s) will be handled at once.")
+
+    @limits.command(name="iprate")
+    async def limits_iprate(self, ctx: commands.Context, per_minute: int):
+        """Set the requests allowed per minute from one client IP. Use 0 to disable."""
+        if per_minute < 0:
+            await ctx.send("❌ The rate limit cannot be negative.")
+            return
+        await self.config.ip_rate_limit.set(per_minute)
+        self.ip_buckets.configure(per_minute)
+        status = f"limited to {per_minute} per minute" if per_minute else "no longer limited"
+        await ctx.send(f"✅ Requests per client IP are {status}.")
+
+    @limits.command(name="userrate")
+    async def limits_userrate(self, ctx: commands.Context, per_minute: int):
+        """Set the verification attempts allowed per minute for one user. Use 0 to disable."""
+        if per_minute < 0:
+            await ctx.send("❌ The rate limit cannot be negative.")
+            return
+        await self.config.user_rate_limit.set(per_minute)
+        self.user_buckets.configure(per_minute)
+        status = f"limited to {per_minute} per minute" if per_minute else "no longer limited"
+        await ctx.send(f"✅ Verification attempts per user are {status}.")
+
+    @limits.command(name="forwardedfor")
+    async def limits_forwardedfor(self, ctx: commands.Context, trust: bool, hops: int = 1):
+        """Take the client IP from `X-Forwarded-For`. Only enable this behind a reverse proxy that sets it.
+
+        Args:
+            trust: Whether to read the header at all
+            hops: Number of trusted proxies in front of the bot; the client IP is taken this many entries from the right (default: 1)
+        """
+        if hops < 1:
+            await ctx.send("❌ There must be at least 1 proxy hop.")
+            return
+        await self.config.trust_forwarded_for.set(trust)
+        await self.config.forwarded_for_hops.set(hops)
+        self._trust_forwarded_for = trust
+        self._forwarded_for_hops = hops
+        source = f"the X-Forwarded-For entry added by your proxies ({hops} hop(s) back)" if trust else "the connection address"
+        await ctx.send(f"✅ Per-IP limits now use {source}.")
+
     @verifyconfig.command()
     async def url(self, ctx: commands.Context, url: str):
         """Set the verification URL base (where users will be sent for verification)."""
@@ -1061,43 +1900,69 @@ This link will expire in 30 minutes."""
         await ctx.send(f"The verification URL has been set to: {url}")
 
     @verifyconfig.command()
-    async def incorrectanswers(self, ctx: commands.Context, limit: int = 20):
+    async def incorrectanswers(self, ctx: commands.Context, limit: Optional[int] = 20, page: Optional[int] = 1, *, filters: str = ""):
         """View logged incorrect answers grouped by normalized form with statistics.
 
+        Filters are `key:value` pairs after the page number:
+        - `guild:<id>` only counts attempts made in that server
+        - `since:<duration>` only shows answers seen within the window, most recent first (e.g. `since:24h`)
+        - `min:<count>` hides answers with fewer attempts
+
         Args:
-            limit: Maximum number of entries to show (default: 20)
+            limit: Maximum number of entries per page (default: 20, at most 25)
+            page: Page to show (default: 1)
+            filters: Optional `guild:`, `since:` and `min:` filters
         """
-        incorrect_answers = await self.config.incorrect_answers()
+        guild_id = None
+        since = None
+        min_count = 0
+        for token in filters.split():
+            key, _, value = token.partition(":")
+            try:
+                if key == "guild":
+                    guild_id = int(value)
+                elif key == "since":
+                    window = commands.parse_timedelta(value)
+                    if window is None:
+                        raise ValueError(value)
+                    since = int(time.time() - window.total_seconds())
+                elif key == "min":
+                    min_count = int(value)
+                else:
+                    raise ValueError(key)
+            except (ValueError, commands.BadArgument):
+                await ctx.send(f"❌ Invalid filter `{token}`. Use `guild:<id>`, `since:<duration>` or `min:<count>`.")
+                return
 
-        if not incorrect_answers:
+        # Embeds hold at most 25 fields
+        limit = 25 if limit <= 0 else min(limit, 25)
+        page = max(page, 1)
+
+        await self.incorrect_log.flush()
+        index = self.incorrect_log.index
+
+        if not len(index):
             await ctx.send("No incorrect answers have been logged yet.")
             return
 
-        # Sort entries by count (descending) then by last seen (most recent first)
-        sorted_entries = sorted(
-            incorrect_answers.items(),
-            key=lambda x: (x[1]["count"], x[1]["last_seen"]),
-            reverse=True
-        )
-
-        # Limit the results
-        if limit > 0:
-            sorted_entries = sorted_entries[:limit]
+        entries, has_more = index.page((page - 1) * limit, limit, guild_id=guild_id, since=since, min_count=min_count)
+        if not entries:
+            await ctx.send("No incorrect answers match on this page.")
+            return
 
-        embed = discord.Embed(
-            title=f"Incorrect Answers Log (Top {len(sorted_entries)})",
-            description=f"Total unique incorrect answers: {len(incorrect_answers)}",
-            color=0xff6b6b
-        )
+        title = f"Incorrect Answers Log (Top {len(entries)})" if page == 1 else f"Incorrect Answers Log (Page {page})"
+        description = f"Total unique incorrect answers: {len(index)}"
+        if filters.strip():
+            description += f"\nFilters: {' '.join(f'`{token}`' for token in filters.split())}"
+        embed = discord.Embed(title=title, description=description, color=0xff6b6b)
 
         current_time = int(time.time())
 
-        for normalized_answer, data in sorted_entries:
-            count = data["count"]
+        for normalized_answer, data in entries:
+            count = guild_counts(data).get(str(guild_id), 0) if guild_id is not None else data["count"]
             original_forms = data.get("original_forms", [normalized_answer])
-            first_seen = data["first_seen"]
             last_seen = data["last_seen"]
-            unique_users = len(data.get("users", []))
+            unique_users = unique_user_count(data)
 
             # Calculate time since last seen
             time_diff = current_time - last_seen
@@ -1123,22 +1988,24 @@ This link will expire in 30 minutes."""
             embed.add_field(name=field_name, value=field_value, inline=False)
 
         # Add summary statistics
-        total_attempts = sum(data["count"] for data in incorrect_answers.values())
-        embed.set_footer(text=f"Total incorrect attempts: {total_attempts}")
+        footer = f"Total incorrect attempts: {index.total_attempts} • Page {page}"
+        if has_more:
+            footer += f" • Next: incorrectanswers {limit} {page + 1} {filters}".rstrip()
+        embed.set_footer(text=footer)
 
         await ctx.send(embed=embed)
 
     @verifyconfig.command()
     async def clearincorrectanswers(self, ctx: commands.Context):
         """Clear all logged incorrect answers (requires confirmation)."""
-        incorrect_answers = await self.config.incorrect_answers()
+        await self.incorrect_log.flush()
+        total_entries = len(self.incorrect_log.index)
 
-        if not incorrect_answers:
+        if not total_entries:
             await ctx.send("No incorrect answers to clear.")
             return
 
-        total_entries = len(incorrect_answers)
-        total_attempts = sum(data["count"] for data in incorrect_answers.values())
+        total_attempts = self.incorrect_log.index.total_attempts
 
         # Ask for confirmation
         confirm_msg = await ctx.send(
@@ -1168,7 +2035,7 @@ This link will expire in 30 minutes."""
             return
 
         # Clear the data
-        await self.config.incorrect_answers.set({})
+        await self.incorrect_log.clear()
         await ctx.send(f"✅ Cleared {total_entries} unique incorrect answers ({total_attempts} total attempts).")
 
     async def red_delete_data_for_user(self, **kwargs):
@@ -1176,6 +2043,5 @@ This link will expire in 30 minutes."""
         user_id = kwargs.get("user_id")
         if user_id:
             # Remove user from verification records
-            async with self.config.verified_members() as verified_members:
-                if str(user_id) in verified_members:
-                    del verified_members[str(user_id)]
+            await self.remove_verified_member(int(user_id))
+            await self.job_queue.discard_user(int(user_id))